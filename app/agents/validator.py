@@ -1,6 +1,7 @@
 
 from agents import Agent
 import os
+from app.models.responses import ValidationResult, ValidationResultBatch
 
 validator_agent = Agent(
     name="QualityValidatorAgent",
@@ -16,25 +17,6 @@ EVALUATION CRITERIA:
 3. **Fluency** (20%): Does it read naturally in the target language?
 4. **Terminology** (10%): Are technical/specialized terms correctly translated?
 
-OUTPUT FORMAT (JSON only, no markdown):
-{
-    "quality_score": 85,
-    "accuracy_score": 90,
-    "completeness_score": 95,
-    "fluency_score": 75,
-    "terminology_score": 80,
-    "issues": [
-        {
-            "severity": "high",
-            "type": "mistranslation",
-            "description": "Technical term incorrectly translated",
-            "location": "paragraph 2"
-        }
-    ],
-    "overall_assessment": "Good translation with minor fluency issues in paragraph 2",
-    "recommendation": "pass"
-}
-
 SCORING GUIDELINES:
 - 90-100: Excellent translation, publication-ready
 - 75-89: Good translation, minor improvements possible
@@ -47,7 +29,14 @@ RECOMMENDATIONS:
 - "review": Minor issues, manual review recommended
 - "retranslate": Quality too low, needs re-translation
 
+Report each problem as an issue with its severity, type, description and location.
 Be thorough but fair. Focus on critical errors over minor stylistic preferences.
-Return ONLY the JSON object, no additional text.
 """,
+    output_type=ValidationResult,
+)
+
+# Same rubric, scoring several numbered segments per call
+batch_validator_agent = validator_agent.clone(
+    name="BatchQualityValidatorAgent",
+    output_type=ValidationResultBatch,
 )
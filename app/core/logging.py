@@ -1,11 +1,35 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 
+_listener = None
+
 def setup_logging():
+    """
+    Route log records through a queue drained by a background thread.
+
+    Handlers only enqueue the record, so formatting and stdout writes happen
+    off the event-loop thread and a slow terminal or pipe can't stall requests.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
+
+    log_queue = queue.Queue(-1)
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    # The queue handler only merges args into the message; the listener's handler formats it
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s | %(levelname)s | %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
+        format="%(message)s",
+        handlers=[logging.handlers.QueueHandler(log_queue)],
     )
 
 
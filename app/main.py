@@ -1,5 +1,8 @@
 
 
+import asyncio
+import contextlib
+import importlib
 import os
 
 from dotenv import load_dotenv
@@ -7,16 +10,74 @@ load_dotenv()
 if not os.getenv("OPENAI_API_KEY"):
     print("⚠️ OPENAI_API_KEY is not set")
 
+import math
+import time
 import tempfile
 import shutil
 import json
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from app.orchestrator import TranslationOrchestrator
-from app.core.logging import setup_logging
+from app.core.logging import setup_logging, get_logger
 
 setup_logging()
+logger = get_logger("WS")
+
+# Format-specific services the orchestrator imports lazily on first use
+_WARMUP_MODULES = (
+    "app.services.pdf_formatter",
+    "app.services.docx_translation",
+    "app.services.docx_loader",
+    "app.services.docx_writer",
+    "app.services.pptx_translation",
+    "app.services.pptx_loader",
+    "app.services.pptx_writer",
+    "app.services.large_doc_translation",
+    "app.services.format_converter",
+    "app.services.ocr",
+)
+
+# Translated files are streamed back in slices of this size
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Coalesce progress frames: at most one per interval (completion is always sent)
+PROGRESS_MIN_INTERVAL = 0.25  # seconds
+
+
+def _warm_services() -> None:
+    for module in _WARMUP_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.warning(f"Warmup import of {module} failed: {e}")
+
+    # Opens the SQLite cache (and purges expired entries) before the first request
+    from app.services.translation_cache import get_translation_cache
+    get_translation_cache()
+
+
+async def _warmup():
+    """Pay import, cache and connection setup cost at startup instead of on the first translation."""
+    start = time.monotonic()
+    await asyncio.to_thread(_warm_services)
+
+    # Establish a pooled TLS connection to the API without spending tokens
+    from app.services.openai_client import get_openai_client
+    try:
+        await get_openai_client().models.list()
+    except Exception as e:
+        logger.warning(f"OpenAI connection warmup failed: {e}")
+
+    logger.info(f"Warmup complete in {time.monotonic() - start:.2f}s")
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: FastAPI):
+    await _warmup()
+    yield
+
+
+app = FastAPI(lifespan=_lifespan)
 
-app = FastAPI()
 
 def _get_output_filename(input_filename: str, output_format: str) -> str:
     """Generate output filename based on format."""
@@ -29,6 +90,75 @@ def _get_output_filename(input_filename: str, output_format: str) -> str:
     ext = ext_map.get(output_format, "pdf")
     return f"translated_{base_name}.{ext}"
 
+
+class _UploadProtocolError(Exception):
+    """The client broke the chunked upload framing."""
+
+
+async def _receive_message(websocket: WebSocket) -> dict:
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    return message
+
+
+def _parse_chunk_header(text: str, last_seq: int) -> dict:
+    """Parse a chunk header, checking its type and that ``seq`` increases."""
+    try:
+        header = json.loads(text)
+    except json.JSONDecodeError:
+        raise _UploadProtocolError("chunk header is not valid JSON")
+
+    if not isinstance(header, dict) or header.get("type") != "chunk":
+        raise _UploadProtocolError('expected a {"type": "chunk"} header before each binary frame')
+
+    seq = header.get("seq")
+    if not isinstance(seq, int) or isinstance(seq, bool):
+        raise _UploadProtocolError("chunk header has no integer seq")
+    if seq <= last_seq:
+        raise _UploadProtocolError(f"chunk seq {seq} does not follow {last_seq}")
+
+    return header
+
+
+async def _receive_file(websocket: WebSocket, path: str) -> None:
+    """
+    Stream an uploaded file straight to disk instead of buffering it in memory.
+
+    The client sends framed chunks: a JSON header {"type": "chunk", "seq": N, "last": bool}
+    followed by one binary frame. Each written chunk is acknowledged with
+    {"type": "ack", "seq": N} so the client can keep a bounded window in flight.
+    A bare binary frame (older clients) is treated as the whole file.
+
+    Disk writes run in a worker thread so slow disks don't stall the event loop.
+    A malformed header raises _UploadProtocolError; the partial file is removed
+    whenever the upload doesn't complete.
+    """
+    try:
+        with open(path, "wb") as f:
+            last_seq = -1
+            while True:
+                message = await _receive_message(websocket)
+                if message.get("bytes") is not None:
+                    await asyncio.to_thread(f.write, message["bytes"])
+                    return
+
+                header = _parse_chunk_header(message.get("text") or "", last_seq)
+                last_seq = header["seq"]
+
+                message = await _receive_message(websocket)
+                if message.get("bytes") is None:
+                    raise _UploadProtocolError(f"chunk {last_seq} header was not followed by a binary frame")
+                await asyncio.to_thread(f.write, message["bytes"])
+                await websocket.send_json({"type": "ack", "seq": last_seq})
+
+                if header.get("last"):
+                    return
+    except BaseException:
+        os.remove(path)
+        raise
+
+
 @app.websocket("/ws/translate")
 async def translate_pdf_ws(websocket: WebSocket):
     await websocket.accept()
@@ -40,34 +170,43 @@ async def translate_pdf_ws(websocket: WebSocket):
         target_language = metadata.get("target_language")
         output_format = metadata.get("output_format", "PDF")  # Default to PDF
 
-        # Second message is the file content
-        pdf_bytes = await websocket.receive_bytes()
+        last_progress = -1
+        last_progress_at = 0.0
 
         async def progress_callback(progress: int):
+            nonlocal last_progress, last_progress_at
+            now = time.monotonic()
+            if progress == last_progress:
+                return
+            if progress < 100 and now - last_progress_at < PROGRESS_MIN_INTERVAL:
+                return
+            last_progress, last_progress_at = progress, now
             await websocket.send_json({"type": "progress", "value": progress})
 
         with tempfile.TemporaryDirectory() as tmpdir:
+            # Following messages stream the file content
             input_path = os.path.join(tmpdir, filename)
-            with open(input_path, "wb") as f:
-                f.write(pdf_bytes)
+            await _receive_file(websocket, input_path)
 
             orchestrator = TranslationOrchestrator()
 
             # Enable validation by default (can be disabled via metadata)
             enable_validation = metadata.get("enable_validation", True)
+            # Opt into the (cheaper, slower) OpenAI Batch API
+            batch_mode = metadata.get("batch_mode", False)
+            # Bypass the translation cache (e.g. to force a fresh translation)
+            use_cache = not metadata.get("no_cache", False)
 
             output_path = await orchestrator.translate(
-                input_path, target_language, progress_callback, output_format, enable_validation
+                input_path, target_language, progress_callback, output_format, enable_validation,
+                batch_mode=batch_mode,
+                use_cache=use_cache,
             )
 
             # Get validation summary
             validation_summary = orchestrator.get_validation_summary()
 
-            # Log validation summary for debugging
-            print(f"\n📊 Validation Summary: {validation_summary}\n")
-
-            with open(output_path, "rb") as f:
-                output_pdf_bytes = f.read()
+            logger.info(f"Validation summary: {validation_summary}")
 
             # Determine output filename based on format
             output_filename = _get_output_filename(filename, output_format)
@@ -77,20 +216,32 @@ async def translate_pdf_ws(websocket: WebSocket):
                 "type": "validation",
                 "summary": validation_summary
             })
-            print(f"✓ Sent validation summary to client")
 
-            # Send the translated file
-            await websocket.send_json({"type": "file", "filename": output_filename})
-            await websocket.send_bytes(output_pdf_bytes)
+            # Stream the translated file: header, binary slices, then eof
+            size = os.path.getsize(output_path)
+            await websocket.send_json({
+                "type": "file",
+                "filename": output_filename,
+                "size": size,
+                "chunks": math.ceil(size / DOWNLOAD_CHUNK_SIZE),
+            })
+            with open(output_path, "rb") as f:
+                while chunk := await asyncio.to_thread(f.read, DOWNLOAD_CHUNK_SIZE):
+                    await websocket.send_bytes(chunk)
+            await websocket.send_json({"type": "eof"})
 
     except WebSocketDisconnect:
-        print("Client disconnected")
+        logger.info("Client disconnected")
+    except _UploadProtocolError as e:
+        logger.warning(f"Rejected upload: {e}")
+        await websocket.send_json({"type": "error", "code": "protocol_error", "message": str(e)})
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.error(f"Translation request failed: {e}")
         await websocket.send_json({"type": "error", "message": str(e)})
     finally:
         pass
 
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
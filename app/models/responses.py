@@ -0,0 +1,32 @@
+from typing import List, Literal
+from pydantic import BaseModel
+
+
+class ValidationIssue(BaseModel):
+    """A single problem found by the quality validator."""
+    severity: Literal["low", "medium", "high", "critical"]
+    type: str
+    description: str
+    location: str
+
+
+class ValidationResult(BaseModel):
+    """
+    Structured output of the quality validator agent.
+
+    Used as the agent's output type, so the model is constrained to this
+    JSON schema server-side instead of following a prose format description.
+    """
+    quality_score: int
+    accuracy_score: int
+    completeness_score: int
+    fluency_score: int
+    terminology_score: int
+    issues: List[ValidationIssue]
+    overall_assessment: str
+    recommendation: Literal["pass", "review", "retranslate"]
+
+
+class ValidationResultBatch(BaseModel):
+    """Structured output of the validator when several segments are scored in one call."""
+    results: List[ValidationResult]
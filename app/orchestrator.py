@@ -1,28 +1,101 @@
 import asyncio
+import functools
+import os
 import random
-from typing import Callable, Awaitable, List
+import tempfile
+from typing import Any, Callable, Awaitable, List
 
 from app.services.loader import LoaderFactory
 from app.services.writer import WriterFactory
 from app.services import chunker, translation, validation
+from app.core.logging import get_logger
+
+logger = get_logger("Orchestrator")
 
 
 # Threshold for using large document translation (characters)
 LARGE_DOC_THRESHOLD = 40000  # ~10,000 tokens with 4 chars/token (~20 pages)
 
+# Parallel page/chunk translations per document; tune to the OpenAI tier rate limit
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("STARK_PAGE_CONCURRENCY", "5"))
+
+
+def _needs_retranslation(result: dict) -> bool:
+    """A validation result below the acceptable threshold (score < 60)."""
+    return result.get("quality_score", 0) < 60 or result.get("recommendation", "review") == "retranslate"
+
+
+def _convert_to_pdf(convert: Callable[[str], str], path: str) -> str:
+    """Convert an intermediate translated document to PDF, then delete the intermediate."""
+    try:
+        return convert(path)
+    finally:
+        os.remove(path)
+
+
+# Format-specific services are imported lazily on first use (they pull in
+# python-docx/python-pptx/PyMuPDF) and cached so later requests skip the import machinery
+@functools.lru_cache(maxsize=None)
+def _pptx_modules():
+    from app.services.pptx_loader import PptxLoader
+    from app.services.pptx_writer import PptxWriter
+    from app.services.pptx_translation import PptxTranslationService
+    return PptxLoader, PptxWriter, PptxTranslationService
+
+
+@functools.lru_cache(maxsize=None)
+def _docx_modules():
+    from app.services.docx_loader import DocxLoader
+    from app.services.docx_writer import DocxWriter
+    from app.services.docx_translation import DocxTranslationService
+    return DocxLoader, DocxWriter, DocxTranslationService
+
+
+@functools.lru_cache(maxsize=None)
+def _pdf_formatting_service():
+    from app.services.pdf_formatter import PdfFormattingService
+    return PdfFormattingService
+
+
+@functools.lru_cache(maxsize=None)
+def _format_converter():
+    from app.services.format_converter import FormatConverter
+    return FormatConverter
+
+
+@functools.lru_cache(maxsize=None)
+def _translate_large_document():
+    from app.services.large_doc_translation import translate_large_document
+    return translate_large_document
+
 
 class TranslationOrchestrator:
-    def __init__(self, max_concurrency: int = 5):
-        # Limit parallel LLM calls (VERY important)
-        self.semaphore = asyncio.Semaphore(max_concurrency)
+    """
+    Routes a document through the right translation workflow.
+
+    Instances are cheap and hold per-call state (validation results, progress),
+    so create one per request. Expensive resources are process-wide singletons
+    already: agents, the OpenAI client, the translation cache and OCR service.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, seed: int | None = None):
+        # Limit parallel LLM calls (VERY important). This is the single admission
+        # point for the request: format services receive the same semaphore.
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.BoundedSemaphore(max_concurrency)
 
         # Progress tracking
         self._completed_chunks = 0
-        self._progress_lock = asyncio.Lock()
+        self._last_progress = -1
 
         # Quality validation tracking
-        self.validation_results = []
+        self._reset_validation()
         self.enable_validation = True  # Toggle quality validation
+        # Chooses validation samples; pass a seed for reproducible validation runs
+        self._rng = random.Random(seed)
+
+        # Route chunk translation through the OpenAI Batch API
+        self.batch_mode = False
 
     async def translate(
         self,
@@ -31,6 +104,8 @@ class TranslationOrchestrator:
         progress_callback: Callable[[int], Awaitable[None]] | None = None,
         output_format: str = "PDF",
         enable_validation: bool = True,
+        batch_mode: bool = False,
+        use_cache: bool = True,
     ) -> str:
         """
         Translate a document with optional quality validation.
@@ -41,22 +116,42 @@ class TranslationOrchestrator:
             progress_callback: Optional progress update callback
             output_format: Output format (PDF, PPTX, DOCX)
             enable_validation: Enable quality validation (default: True)
+            batch_mode: Use the OpenAI Batch API for text-based documents
+                (cheaper, but may take up to 24h). Only used when requested:
+                interactive callers can't wait out the completion window.
+            use_cache: Reuse cached translations of identical text (default: True)
 
         Returns:
             Path to translated document
         """
         self.enable_validation = enable_validation
-        self.validation_results = []  # Reset validation results
+        self.batch_mode = batch_mode
+        self._reset_validation()
+        self._completed_chunks = 0  # Reset progress counter
+        self._last_progress = -1
+
+        # Scoped to this call; tasks spawned below inherit the setting
+        cache_token = translation.cache_enabled.set(use_cache)
+        try:
+            return await self._route(file_path, target_language, progress_callback, output_format)
+        finally:
+            translation.cache_enabled.reset(cache_token)
 
-        # Route to specialized workflows based on file type
+    async def _route(
+        self,
+        file_path: str,
+        target_language: str,
+        progress_callback: Callable[[int], Awaitable[None]] | None,
+        output_format: str,
+    ) -> str:
+        """Route to the specialized workflow for the file type."""
         file_lower = file_path.lower()
 
         if file_lower.endswith('.pptx'):
             output_path = await self._translate_pptx(file_path, target_language, progress_callback)
             # Convert to PDF if requested
             if output_format.upper() == "PDF":
-                from app.services.format_converter import FormatConverter
-                return FormatConverter.pptx_to_pdf(output_path)
+                return _convert_to_pdf(_format_converter().pptx_to_pdf, output_path)
             return output_path
         elif file_lower.endswith('.pdf'):
             return await self._translate_pdf(file_path, target_language, progress_callback)
@@ -64,8 +159,7 @@ class TranslationOrchestrator:
             output_path = await self._translate_docx(file_path, target_language, progress_callback)
             # Convert to PDF if requested
             if output_format.upper() == "PDF":
-                from app.services.format_converter import FormatConverter
-                return FormatConverter.docx_to_pdf(output_path)
+                return _convert_to_pdf(_format_converter().docx_to_pdf, output_path)
             return output_path
         elif file_lower.endswith('.odt'):
             return await self._translate_standard(
@@ -91,6 +185,76 @@ class TranslationOrchestrator:
                 output_format=output_format,
             )
 
+    async def translate_bytes(
+        self,
+        input_bytes: bytes,
+        filename: str,
+        target_language: str,
+        progress_callback: Callable[[int], Awaitable[None]] | None = None,
+        output_format: str = "PDF",
+        enable_validation: bool = True,
+        batch_mode: bool = False,
+        use_cache: bool = True,
+    ) -> bytes:
+        """
+        Translate an in-memory document and return the translated file content.
+
+        Loaders and writers are path based, so the input is spooled to a private
+        temp directory once. The input and the returned output file are removed
+        before returning; intermediate files (e.g. the translated PPTX/DOCX
+        behind a PDF output) are removed by translate itself.
+
+        Args:
+            input_bytes: Source document content
+            filename: Original filename (its extension selects the workflow)
+            (remaining arguments as in translate)
+
+        Returns:
+            Translated document content
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = os.path.join(tmpdir, os.path.basename(filename))
+            with open(input_path, "wb") as f:
+                f.write(input_bytes)
+
+            output_path = await self.translate(
+                input_path,
+                target_language,
+                progress_callback,
+                output_format,
+                enable_validation,
+                batch_mode=batch_mode,
+                use_cache=use_cache,
+            )
+
+        try:
+            with open(output_path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(output_path)
+
+    def _reset_validation(self) -> None:
+        self.validation_results = []
+        # Running aggregates so get_validation_summary is O(1) however often it's polled
+        self._quality_sum = 0
+        self._issue_count = 0
+        self._high_severity_count = 0
+        self._skipped_count = 0
+        self._untranslated_count = 0
+
+    def _record_validation(self, results: List[dict]) -> None:
+        """Store validation results and update the running aggregates."""
+        for result in results:
+            self._quality_sum += result.get("quality_score", 0)
+            issues = result.get("issues", [])
+            self._issue_count += len(issues)
+            self._high_severity_count += sum(1 for i in issues if i.get("severity") == "high")
+            if result.get("validation_type") == "skipped":
+                self._skipped_count += 1
+            elif result.get("validation_type") == "untranslated":
+                self._untranslated_count += 1
+        self.validation_results.extend(results)
+
     def get_validation_summary(self) -> dict:
         """
         Get a summary of validation results.
@@ -105,21 +269,16 @@ class TranslationOrchestrator:
                 "message": "No validation performed"
             }
 
-        total_quality = sum(v.get("quality_score", 0) for v in self.validation_results)
-        avg_quality = total_quality / len(self.validation_results)
-
-        all_issues = []
-        for v in self.validation_results:
-            all_issues.extend(v.get("issues", []))
-
-        high_severity_issues = [i for i in all_issues if i.get("severity") == "high"]
+        avg_quality = self._quality_sum / len(self.validation_results)
 
         return {
             "validation_enabled": self.enable_validation,
             "chunks_validated": len(self.validation_results),
+            "chunks_skipped": self._skipped_count,
+            "chunks_untranslated": self._untranslated_count,
             "average_quality_score": round(avg_quality, 1),
-            "total_issues": len(all_issues),
-            "high_severity_issues": len(high_severity_issues),
+            "total_issues": self._issue_count,
+            "high_severity_issues": self._high_severity_count,
             "recommendation": "pass" if avg_quality >= 75 else "review" if avg_quality >= 60 else "retranslate",
             "assessment": (
                 "Excellent quality" if avg_quality >= 90 else
@@ -136,9 +295,7 @@ class TranslationOrchestrator:
         progress_callback: Callable[[int], Awaitable[None]] | None = None,
     ) -> str:
         """Specialized translation workflow for PPTX with formatting preservation."""
-        from app.services.pptx_loader import PptxLoader
-        from app.services.pptx_writer import PptxWriter
-        from app.services.pptx_translation import PptxTranslationService
+        PptxLoader, PptxWriter, PptxTranslationService = _pptx_modules()
 
         # 1. Load PPTX with structure preservation
         if progress_callback:
@@ -151,7 +308,10 @@ class TranslationOrchestrator:
         if progress_callback:
             await progress_callback(10)
 
-        translation_service = PptxTranslationService(max_concurrency=self.semaphore._value)
+        translation_service = PptxTranslationService(
+            max_concurrency=self.max_concurrency,
+            semaphore=self.semaphore
+        )
         translated_slides = await translation_service.translate_slides(
             slides_data,
             target_language,
@@ -186,23 +346,25 @@ class TranslationOrchestrator:
         progress_callback: Callable[[int], Awaitable[None]] | None = None,
     ) -> str:
         """Specialized translation workflow for PDF with formatting preservation."""
-        from app.services.pdf_formatter import PdfFormattingService
+        PdfFormattingService = _pdf_formatting_service()
 
         # Translate PDF with formatting preservation
-        formatter = PdfFormattingService(max_concurrency=self.semaphore._value)
+        formatter = PdfFormattingService(semaphore=self.semaphore)
         output_path = await formatter.translate_pdf(
             file_path,
             target_language,
             progress_callback
         )
 
-        # Validate translation if enabled
+        # Validate translation if enabled, reusing the page texts the formatter already has
         if self.enable_validation:
             await self._validate_document(
                 file_path,
                 output_path,
                 target_language,
-                progress_callback
+                progress_callback,
+                source_pages=formatter.source_pages,
+                translated_pages=formatter.translated_pages,
             )
 
         return output_path
@@ -214,9 +376,7 @@ class TranslationOrchestrator:
         progress_callback: Callable[[int], Awaitable[None]] | None = None,
     ) -> str:
         """Specialized translation workflow for DOCX with formatting preservation."""
-        from app.services.docx_loader import DocxLoader
-        from app.services.docx_writer import DocxWriter
-        from app.services.docx_translation import DocxTranslationService
+        DocxLoader, DocxWriter, DocxTranslationService = _docx_modules()
 
         # 1. Load DOCX with structure preservation
         if progress_callback:
@@ -226,7 +386,10 @@ class TranslationOrchestrator:
         document_data = loader.load(file_path)
 
         # 2. Translate with structure preservation
-        translation_service = DocxTranslationService(max_concurrency=self.semaphore._value)
+        translation_service = DocxTranslationService(
+            max_concurrency=self.max_concurrency,
+            semaphore=self.semaphore
+        )
         translated_document = await translation_service.translate_document(
             document_data,
             target_language,
@@ -266,9 +429,8 @@ class TranslationOrchestrator:
         loader = LoaderFactory.get_loader(file_path)
         pages = loader.load(file_path)
 
-        # Combine all pages to check if this is a large document
-        full_text = "\n\n".join(pages)
-        total_chars = len(full_text)
+        # Size of the pages joined with "\n\n", without building the joined string
+        total_chars = sum(map(len, pages)) + max(0, 2 * (len(pages) - 1))
 
         # If document is large, use smart chunking with context preservation
         if total_chars > LARGE_DOC_THRESHOLD:
@@ -281,35 +443,56 @@ class TranslationOrchestrator:
             )
 
         # 2. Chunk pages (standard approach for smaller documents)
-        page_chunks: List[List[str]] = [chunker.chunk_text(page) for page in pages]
+        # In a worker thread so a big page doesn't stall other requests on the event loop
+        page_chunks: List[List[str]] = await asyncio.to_thread(
+            lambda: [chunker.chunk_text(page) for page in pages]
+        )
         all_chunks: List[str] = [chunk for page in page_chunks for chunk in page]
         total_chunks = len(all_chunks)
 
         # 3. Translate chunks (PARALLEL, SAFE)
-        translation_tasks = [
-            asyncio.create_task(
-                self._translate_chunk_with_progress(
-                    chunk_text,
-                    target_language,
-                    total_chunks,
-                    progress_callback,
-                )
+        if self.batch_mode:
+            translated_chunks = await translation.translate_via_batch_api(
+                all_chunks, target_language
             )
-            for i, chunk_text in enumerate(all_chunks)
-        ]
+            if progress_callback:
+                await progress_callback(90)
+        else:
+            translation_tasks = [
+                asyncio.create_task(
+                    self._translate_chunk_with_progress(
+                        chunk_text,
+                        target_language,
+                        total_chunks,
+                        progress_callback,
+                        idx=i,
+                    )
+                )
+                for i, chunk_text in enumerate(all_chunks)
+            ]
 
-        translated_chunks = await asyncio.gather(*translation_tasks)
+            # Consume results as they finish and place them by index
+            translated_chunks: List[str] = [""] * total_chunks
+            for next_done in asyncio.as_completed(translation_tasks):
+                idx, translated_text = await next_done
+                translated_chunks[idx] = translated_text
 
         # 4. Validation (sampled, PARALLEL, SAFE) - Optional
         if self.enable_validation:
             if progress_callback:
                 await progress_callback(95)
 
-            sample_indices = random.sample(
+            sample_indices = self._rng.sample(
                 range(total_chunks),
                 k=min(5, total_chunks),
             )
 
+            # Score all samples in one validator call; retries are validated individually
+            initial_results = await self._llm_call(lambda: validation.validate_translations_batch(
+                [(all_chunks[idx], translated_chunks[idx]) for idx in sample_indices],
+                target_language,
+            ))
+
             validation_tasks = [
                 asyncio.create_task(
                     self._validate_and_retry_chunk(
@@ -317,13 +500,14 @@ class TranslationOrchestrator:
                         translated_chunks,
                         target_language,
                         idx,
+                        result=initial_result,
                     )
                 )
-                for idx in sample_indices
+                for idx, initial_result in zip(sample_indices, initial_results)
             ]
 
             validation_results = await asyncio.gather(*validation_tasks)
-            self.validation_results.extend(validation_results)
+            self._record_validation(validation_results)
 
         # 5. Reassemble pages
         if progress_callback:
@@ -333,11 +517,9 @@ class TranslationOrchestrator:
         chunk_idx = 0
 
         for page in page_chunks:
-            page_text = ""
-            for _ in page:
-                page_text += translated_chunks[chunk_idx]
-                chunk_idx += 1
-            translated_pages.append(page_text)
+            next_idx = chunk_idx + len(page)
+            translated_pages.append("".join(translated_chunks[chunk_idx:next_idx]))
+            chunk_idx = next_idx
 
         # 6. Write output
         writer = WriterFactory.get_writer(file_path, output_format)
@@ -362,10 +544,7 @@ class TranslationOrchestrator:
         This is triggered when document exceeds LARGE_DOC_THRESHOLD.
         Uses overlapping chunks and context-aware translation for better coherence.
         """
-        from app.services.large_doc_translation import translate_large_document
-        from app.core.logging import get_logger
-
-        logger = get_logger("Orchestrator")
+        translate_large_document = _translate_large_document()
 
         # Combine all pages
         full_text = "\n\n".join(pages)
@@ -384,7 +563,9 @@ class TranslationOrchestrator:
             full_text,
             target_language,
             progress_callback=progress_callback,
-            use_context=True  # Preserve coherence across chunks
+            use_context=True,  # Preserve coherence across chunks
+            use_batch_api=self.batch_mode,
+            semaphore=self.semaphore,
         )
 
         # For now, treat the translated text as a single page for PDF writing
@@ -409,25 +590,34 @@ class TranslationOrchestrator:
     # Internal helpers
     # -------------------------------------------------
 
+    async def _llm_call(self, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one LLM call (translation or validation) under the request's semaphore."""
+        async with self.semaphore:
+            return await coro_factory()
+
     async def _translate_chunk_with_progress(
         self,
         chunk_text: str,
         target_language: str,
         total_chunks: int,
         progress_callback: Callable[[int], Awaitable[None]] | None,
-    ) -> str:
+        idx: int,
+    ) -> tuple[int, str]:
+        """Translate one chunk and return it with its index in the document."""
         async with self.semaphore:
             translated_text = await translation.translate_text(
                 chunk_text, target_language
             )
 
-        if progress_callback:
-            async with self._progress_lock:
-                self._completed_chunks += 1
-                progress = int((self._completed_chunks / total_chunks) * 90)
-                await progress_callback(progress)
+        # No lock needed: the increment has no await, so it's atomic on the event loop.
+        # Only report when the percentage actually moves.
+        self._completed_chunks += 1
+        progress = self._completed_chunks * 90 // total_chunks
+        if progress_callback and progress > self._last_progress:
+            self._last_progress = progress
+            await progress_callback(progress)
 
-        return translated_text
+        return idx, translated_text
 
 
     async def _validate_and_retry_chunk(
@@ -436,45 +626,54 @@ class TranslationOrchestrator:
         translated_chunks: List[str],
         target_language: str,
         idx: int,
+        result: dict | None = None,
     ) -> dict:
         """
         Validate a translated chunk and retry if quality is too low.
 
+        Args:
+            result: Precomputed validation of the current translation (e.g. from a
+                batched validation call); validated here when omitted
+
         Returns:
             Validation result dictionary with quality scores
         """
-        result = await validation.validate_translation(
-            source_chunk,
-            translated_chunks[idx],
-            target_language,
-        )
-
-        quality_score = result.get("quality_score", 0)
-        recommendation = result.get("recommendation", "review")
+        if result is None:
+            result = await self._llm_call(lambda: validation.validate_translation(
+                source_chunk,
+                translated_chunks[idx],
+                target_language,
+            ))
 
         # Retry if quality is below acceptable threshold (score < 60)
-        if quality_score < 60 or recommendation == "retranslate":
-            print(
-                f"⚠️  Chunk {idx} quality too low (score: {quality_score}). "
+        if _needs_retranslation(result):
+            logger.warning(
+                f"Chunk {idx} quality too low (score: {result.get('quality_score', 0)}). "
                 f"Retrying translation..."
             )
 
-            async with self.semaphore:
-                new_translation = await translation.translate_text(
-                    source_chunk, target_language
-                )
+            # The cached (and in-flight) translation is the one that just failed,
+            # so bypass both; the retry replaces the cache entry
+            new_translation = await self._llm_call(lambda: translation.translate_text(
+                source_chunk, target_language, refresh=True
+            ))
 
             translated_chunks[idx] = new_translation
 
             # Validate retry
-            retry_result = await validation.validate_translation(
+            retry_result = await self._llm_call(lambda: validation.validate_translation(
                 source_chunk,
                 new_translation,
                 target_language,
+            ))
+            logger.info(
+                f"Chunk {idx} retry complete. New score: {retry_result.get('quality_score', 'N/A')}"
             )
-            print(
-                f"✓ Chunk {idx} retry complete. New score: {retry_result.get('quality_score', 'N/A')}"
-            )
+
+            # Don't keep serving a translation that failed validation twice
+            if _needs_retranslation(retry_result):
+                translation.forget_translation(source_chunk, target_language)
+
             return retry_result
 
         return result
@@ -485,6 +684,8 @@ class TranslationOrchestrator:
         translated_path: str,
         target_language: str,
         progress_callback: Callable[[int], Awaitable[None]] | None = None,
+        source_pages: List[str] | None = None,
+        translated_pages: List[str] | None = None,
     ) -> None:
         """
         Validate translated document by sampling text from both files.
@@ -494,29 +695,26 @@ class TranslationOrchestrator:
             translated_path: Path to translated document
             target_language: Target language code
             progress_callback: Optional progress callback
+            source_pages: Source page texts already in memory (skips reloading source_path)
+            translated_pages: Translated page texts already in memory (skips reloading translated_path)
         """
-        from app.services.loader import LoaderFactory
-        from app.core.logging import get_logger
-
-        logger = get_logger("Orchestrator")
-
         try:
             # Extract text from both documents
-            source_loader = LoaderFactory.get_loader(source_path)
-            source_pages = source_loader.load(source_path)
+            if source_pages is None:
+                source_loader = LoaderFactory.get_loader(source_path)
+                source_pages = source_loader.load(source_path)
             source_text = "\n\n".join(source_pages)
 
-            translated_loader = LoaderFactory.get_loader(translated_path)
-            translated_pages = translated_loader.load(translated_path)
+            if translated_pages is None:
+                translated_loader = LoaderFactory.get_loader(translated_path)
+                translated_pages = translated_loader.load(translated_path)
             translated_text = "\n\n".join(translated_pages)
 
             # Chunk the text for validation
-            from app.services import chunker
             source_chunks = chunker.chunk_text(source_text, max_chars=4000)
             translated_chunks = chunker.chunk_text(translated_text, max_chars=4000)
 
             # Sample chunks for validation (max 5 samples)
-            import random
             num_chunks = min(len(source_chunks), len(translated_chunks))
             sample_size = min(5, num_chunks)
 
@@ -525,23 +723,18 @@ class TranslationOrchestrator:
                 return
 
             # Use same indices for both source and translated
-            sample_indices = random.sample(range(num_chunks), sample_size) if num_chunks > sample_size else list(range(num_chunks))
+            sample_indices = self._rng.sample(range(num_chunks), sample_size) if num_chunks > sample_size else list(range(num_chunks))
 
             logger.info(f"Validating {sample_size} of {num_chunks} chunks from document")
 
-            # Validate sampled chunks
-            validation_results = []
-            for idx in sample_indices:
-                if idx < len(source_chunks) and idx < len(translated_chunks):
-                    result = await validation.validate_translation(
-                        source_chunks[idx],
-                        translated_chunks[idx],
-                        target_language,
-                    )
-                    validation_results.append(result)
+            # Validate sampled chunks in a single validator call
+            validation_results = await self._llm_call(lambda: validation.validate_translations_batch(
+                [(source_chunks[idx], translated_chunks[idx]) for idx in sample_indices],
+                target_language,
+            ))
 
             # Store results
-            self.validation_results.extend(validation_results)
+            self._record_validation(validation_results)
 
             # Log summary
             if validation_results:
@@ -10,6 +10,43 @@ Strategies for handling documents that exceed context windows:
 import re
 from typing import List, Dict, Any
 
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to the chars-per-token estimate
+    tiktoken = None
+
+# Compiled once; chunking runs these over every character of large documents
+_SECTION_RE = re.compile(r'(\n\s*\n)')
+_OVERLAP_RE = re.compile(r'[.!?]+\s+')
+
+
+def split_by_sentences(section: str, max_chars: int) -> List[str]:
+    """
+    Greedily pack the sentences of a section into pieces of at most max_chars.
+
+    A single sentence longer than max_chars is kept whole.
+    """
+    # Single scan over sentence boundaries; pieces are sliced out only when emitted
+    chunks = []
+    start = 0           # start of the piece being packed
+    sentence_start = 0  # start of the sentence being considered
+
+    for match in _OVERLAP_RE.finditer(section):
+        sentence_end = match.end()
+        if sentence_end - start > max_chars and sentence_start > start:
+            chunks.append(section[start:sentence_start])
+            start = sentence_start
+        sentence_start = sentence_end
+
+    # Trailing text after the last boundary
+    if len(section) - start > max_chars and sentence_start > start:
+        chunks.append(section[start:sentence_start])
+        start = sentence_start
+    if start < len(section):
+        chunks.append(section[start:])
+
+    return chunks
+
 
 class SmartChunker:
     """
@@ -28,10 +65,26 @@ class SmartChunker:
         overlap_tokens: int = 200,  # Context overlap
         chars_per_token: int = 4   # Rough estimate: 1 token ≈ 4 chars
     ):
+        self.max_tokens = max_tokens
         self.max_chars = max_tokens * chars_per_token
         self.overlap_chars = overlap_tokens * chars_per_token
         self.chars_per_token = chars_per_token
 
+        # Sizes are exact token counts with tiktoken, otherwise character counts
+        self._budget = max_tokens if tiktoken is not None else self.max_chars
+
+    # Shared tiktoken encoding, created on first use
+    _encoder = None
+
+    def _size(self, text: str) -> int:
+        """Size of text in the units of self._budget (tokens with tiktoken, else characters)."""
+        if tiktoken is None:
+            return len(text)
+        if SmartChunker._encoder is None:
+            # o200k_base is the encoding of the gpt-4o model family
+            SmartChunker._encoder = tiktoken.get_encoding("o200k_base")
+        return len(SmartChunker._encoder.encode_ordinary(text))
+
     def chunk_text(self, text: str) -> List[Dict[str, Any]]:
         """
         Chunk text intelligently with metadata.
@@ -42,69 +95,80 @@ class SmartChunker:
             - index: chunk number
             - has_overlap: whether this chunk has context from previous
             - boundary_type: what type of boundary (paragraph, sentence, etc.)
+            - previous_context: overlap text carried over from the previous chunk
+            - overlap_len: length of that overlap at the start of ``text`` (0 if absent)
+            - text_core: ``text`` without the leading overlap (what gets translated)
         """
         # First, try to split by major sections (double newlines)
         sections = self._split_by_sections(text)
 
         chunks = []
         current_chunk = ""
+        current_size = 0
         previous_overlap = ""
         chunk_index = 0
 
         for section in sections:
+            section_size = self._size(section)
+
             # If section fits in current chunk
-            if len(current_chunk) + len(section) <= self.max_chars:
+            if current_size + section_size <= self._budget:
                 current_chunk += section
+                current_size += section_size
             else:
                 # Current chunk is full, save it
                 if current_chunk:
-                    chunks.append({
-                        'text': current_chunk,
-                        'index': chunk_index,
-                        'has_overlap': len(previous_overlap) > 0,
-                        'boundary_type': 'section',
-                        'previous_context': previous_overlap
-                    })
+                    chunks.append(self._make_chunk(current_chunk, chunk_index, previous_overlap, 'section'))
 
                     # Prepare overlap for next chunk
                     previous_overlap = self._get_overlap(current_chunk)
                     chunk_index += 1
 
                 # If section itself is too large, split it further
-                if len(section) > self.max_chars:
-                    sub_chunks = self._split_large_section(section)
+                if section_size > self._budget:
+                    sub_chunks = self._split_large_section(section, section_size)
                     for sub_chunk in sub_chunks:
                         full_chunk = previous_overlap + sub_chunk
-                        chunks.append({
-                            'text': full_chunk,
-                            'index': chunk_index,
-                            'has_overlap': len(previous_overlap) > 0,
-                            'boundary_type': 'sentence',
-                            'previous_context': previous_overlap
-                        })
+                        chunks.append(self._make_chunk(full_chunk, chunk_index, previous_overlap, 'sentence'))
                         previous_overlap = self._get_overlap(sub_chunk)
                         chunk_index += 1
                     current_chunk = ""
+                    current_size = 0
                 else:
                     # Start new chunk with overlap
                     current_chunk = previous_overlap + section
+                    current_size = self._size(previous_overlap) + section_size
 
         # Don't forget the last chunk
         if current_chunk:
-            chunks.append({
-                'text': current_chunk,
-                'index': chunk_index,
-                'has_overlap': len(previous_overlap) > 0,
-                'boundary_type': 'end',
-                'previous_context': previous_overlap
-            })
+            chunks.append(self._make_chunk(current_chunk, chunk_index, previous_overlap, 'end'))
 
         return chunks
 
+    def _make_chunk(
+        self,
+        text: str,
+        index: int,
+        previous_overlap: str,
+        boundary_type: str
+    ) -> Dict[str, Any]:
+        """Build a chunk dict, splitting off the leading overlap once here."""
+        # A chunk started while no chunk was open carries no overlap prefix
+        overlap_len = len(previous_overlap) if previous_overlap and text.startswith(previous_overlap) else 0
+        return {
+            'text': text,
+            'index': index,
+            'has_overlap': len(previous_overlap) > 0,
+            'boundary_type': boundary_type,
+            'previous_context': previous_overlap,
+            'overlap_len': overlap_len,
+            'text_core': text[overlap_len:] if overlap_len else text,
+        }
+
     def _split_by_sections(self, text: str) -> List[str]:
         """Split text by paragraphs/sections (double newlines)."""
         # Split on double newlines but keep the newlines
-        sections = re.split(r'(\n\s*\n)', text)
+        sections = _SECTION_RE.split(text)
 
         # Recombine section content with their separators
         result = []
@@ -115,31 +179,15 @@ class SmartChunker:
 
         return [s for s in result if s.strip()]
 
-    def _split_large_section(self, section: str) -> List[str]:
+    def _split_large_section(self, section: str, section_size: int | None = None) -> List[str]:
         """Split a large section by sentences."""
-        # Split by sentence boundaries
-        sentences = re.split(r'([.!?]+\s+)', section)
-
-        chunks = []
-        current = ""
+        if tiktoken is None or not section_size:
+            return split_by_sentences(section, self.max_chars)
 
-        # Recombine sentences with their punctuation
-        for i in range(0, len(sentences), 2):
-            sentence = sentences[i]
-            punct = sentences[i + 1] if i + 1 < len(sentences) else ''
-            full_sentence = sentence + punct
-
-            if len(current) + len(full_sentence) <= self.max_chars:
-                current += full_sentence
-            else:
-                if current:
-                    chunks.append(current)
-                current = full_sentence
-
-        if current:
-            chunks.append(current)
-
-        return chunks
+        # Convert the token budget to characters using this section's own density,
+        # so dense scripts (CJK) get proportionally shorter pieces
+        max_chars = max(1, len(section) * self._budget // section_size)
+        return split_by_sentences(section, max_chars)
 
     def _get_overlap(self, text: str) -> str:
         """
@@ -150,18 +198,17 @@ class SmartChunker:
         if len(text) <= self.overlap_chars:
             return text
 
-        # Take the last overlap_chars characters
+        # Look only at the last overlap_chars characters
         overlap_start = len(text) - self.overlap_chars
-        overlap_text = text[overlap_start:]
 
         # Find the first sentence boundary to start from
-        sentence_match = re.search(r'[.!?]+\s+', overlap_text)
+        sentence_match = _OVERLAP_RE.search(text, overlap_start)
         if sentence_match:
             # Start from after the first sentence boundary
-            return overlap_text[sentence_match.end():]
+            return text[sentence_match.end():]
 
         # If no sentence boundary, return the whole overlap
-        return overlap_text
+        return text[overlap_start:]
 
 
 def chunk_text(text: str, max_chars=4000) -> list[str]:
@@ -171,16 +218,27 @@ def chunk_text(text: str, max_chars=4000) -> list[str]:
     For large documents, use SmartChunker instead.
     Updated to handle larger chunks (4000 chars) for improved coherence.
     """
-    chunks, current = [], ""
+    # Collect paragraphs per chunk and join once, instead of re-copying a growing string
+    chunks: list[str] = []
+    current_parts: list[str] = []
+    current_len = 0
     for para in text.split("\n\n"):
-        if len(current) + len(para) < max_chars:
-            current += para + "\n\n"
-        else:
-            if current:
-                chunks.append(current)
-            current = para + "\n\n"
-    if current:
-        chunks.append(current)
+        if current_len + len(para) >= max_chars and current_parts:
+            chunks.append("".join(current_parts))
+            current_parts, current_len = [], 0
+
+        # An oversize paragraph is split at sentence boundaries so no chunk exceeds the limit
+        if len(para) + 2 >= max_chars:
+            # (pieces are contiguous, so only the last one gets the paragraph break)
+            pieces = split_by_sentences(para, max_chars - 2)
+            chunks.extend(pieces[:-1])
+            para = pieces[-1] if pieces else para
+
+        current_parts.append(para)
+        current_parts.append("\n\n")
+        current_len += len(para) + 2
+    if current_parts:
+        chunks.append("".join(current_parts))
     return chunks
 
 
@@ -5,10 +5,14 @@ from typing import List, Dict, Any
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.table import Table
-from docx.oxml.table import CT_Tbl
-from docx.oxml.text.paragraph import CT_P
+from docx.oxml.ns import qn
 from docx.text.paragraph import Paragraph
 
+# Clark-notation tags, compared as plain strings while walking the body
+_P_TAG = qn('w:p')
+_TBL_TAG = qn('w:tbl')
+_T_TAG = qn('w:t')
+
 
 class DocxLoader:
     """
@@ -33,15 +37,17 @@ class DocxLoader:
 
         elements = []
 
-        # Process all body elements (paragraphs and tables)
-        for element in doc.element.body:
-            if isinstance(element, CT_P):
+        # Process all body elements (paragraphs and tables); a tag compare is
+        # cheaper than isinstance() against the lxml custom element classes
+        for element in doc.element.body.iterchildren():
+            tag = element.tag
+            if tag == _P_TAG:
                 # Paragraph
                 paragraph = Paragraph(element, doc)
                 para_data = self._extract_paragraph_data(paragraph)
                 if para_data:
                     elements.append(para_data)
-            elif isinstance(element, CT_Tbl):
+            elif tag == _TBL_TAG:
                 # Table
                 table = Table(element, doc)
                 table_data = self._extract_table_data(table)
@@ -55,32 +61,41 @@ class DocxLoader:
 
     def _extract_paragraph_data(self, paragraph: Paragraph) -> Dict[str, Any] | None:
         """Extract paragraph with formatting metadata."""
-        # Skip empty paragraphs
-        if not paragraph.text.strip():
-            return None
+        runs = []
+        run_texts = []
 
-        para_data = {
-            'type': 'paragraph',
-            'text': paragraph.text,
-            'style': paragraph.style.name if paragraph.style else None,
-            'alignment': paragraph.alignment,
-            'runs': []
-        }
-
-        # Extract run-level formatting
+        # Extract run-level formatting; paragraph text is joined from the run
+        # texts collected here instead of walking the runs again via paragraph.text
         for run in paragraph.runs:
-            run_data = {
-                'text': run.text,
+            text = run.text
+            run_texts.append(text)
+            runs.append({
+                'text': text,
                 'bold': run.bold,
                 'italic': run.italic,
                 'underline': run.underline,
                 'font_name': run.font.name,
                 'font_size': run.font.size.pt if run.font.size else None,
                 'font_color': self._get_color(run.font.color) if run.font.color else None,
-            }
-            para_data['runs'].append(run_data)
+            })
+
+        text = ''.join(run_texts)
+        if not text or text.isspace():
+            # Text that only lives in hyperlinks isn't part of paragraph.runs;
+            # the writer counts such paragraphs, so they must not be skipped
+            text = paragraph.text
 
-        return para_data
+            # Skip empty paragraphs
+            if not text or text.isspace():
+                return None
+
+        return {
+            'type': 'paragraph',
+            'text': text,
+            'style': paragraph.style.name if paragraph.style else None,
+            'alignment': paragraph.alignment,
+            'runs': runs
+        }
 
     def _extract_table_data(self, table: Table) -> Dict[str, Any]:
         """Extract table content with structure."""
@@ -98,7 +113,7 @@ class DocxLoader:
 
                 cells_data.append({
                     'paragraphs': cell_paragraphs,
-                    'text': cell.text  # Combined text for convenience
+                    'text': self._cell_text(cell)  # Combined text for convenience
                 })
 
             rows_data.append(cells_data)
@@ -110,6 +125,13 @@ class DocxLoader:
             'num_cols': len(table.columns) if table.rows else 0
         }
 
+    def _cell_text(self, cell) -> str:
+        """Join a cell's paragraph texts straight from the XML, without Paragraph wrappers."""
+        return '\n'.join(
+            ''.join(t.text or '' for t in p.iter(_T_TAG))
+            for p in cell._tc.iterchildren(_P_TAG)
+        )
+
     def _get_color(self, color_obj) -> str | None:
         """Extract color from font color object."""
         try:
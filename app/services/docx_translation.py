@@ -2,17 +2,23 @@
 DOCX Translation Service - Handles structured translation with formatting preservation
 """
 import asyncio
+import operator
 from typing import Dict, Any, List, Callable, Awaitable
 from app.services import translation
 
+# C-level accessor for the 'text' field of run/paragraph dicts
+_run_text = operator.itemgetter('text')
+
 
 class DocxTranslationService:
     """
     Translates DOCX content while preserving structure and formatting.
     """
 
-    def __init__(self, max_concurrency: int = 5):
-        self.semaphore = asyncio.Semaphore(max_concurrency)
+    def __init__(self, max_concurrency: int = 5, semaphore: asyncio.Semaphore | None = None):
+        # Pass the orchestrator's semaphore so every workflow shares one admission limit
+        self.semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
 
     async def translate_document(
         self,
@@ -31,212 +37,138 @@ class DocxTranslationService:
         Returns:
             Dict with translated elements
         """
-        # Collect all translatable text items
-        text_items = []
-        item_metadata = []
+        # Collect translatable runs per paragraph: the run texts of a paragraph
+        # are translated together in one request, and the run dicts are kept so
+        # translations can be written straight back
+        text_groups: List[tuple[str, ...]] = []
+        run_groups: List[List[Dict[str, Any]]] = []
 
         elements = document_data.get('elements', [])
 
-        for elem_idx, element in enumerate(elements):
-            items = self._collect_text_items(element, elem_idx)
-            text_items.extend([item[0] for item in items])
-            item_metadata.extend([item[1] for item in items])
+        for element in elements:
+            self._collect_text_items(element, text_groups, run_groups)
 
-        total_items = len(text_items)
-        if total_items == 0:
+        if not text_groups:
             return document_data
 
         if progress_callback:
             await progress_callback(10)
 
-        # Translate all text items in parallel
-        translation_tasks = [
-            self._translate_text_with_progress(
-                text,
-                target_language,
-                idx,
-                total_items,
-                progress_callback
-            )
-            for idx, text in enumerate(text_items)
-        ]
-
-        translated_texts = await asyncio.gather(*translation_tasks)
-
-        # Build a mapping of translations
-        translations_map = {}
-        for metadata, translated in zip(item_metadata, translated_texts):
-            key = self._make_key(metadata)
-            translations_map[key] = translated
-
-        # Apply translations back to the structure
-        translated_elements = []
-        for elem_idx, element in enumerate(elements):
-            translated_element = self._apply_translations(
-                element,
-                elem_idx,
-                translations_map
-            )
-            translated_elements.append(translated_element)
+        # Translate each distinct paragraph once (headings, cell labels and
+        # boilerplate repeat across paragraphs/cells), in parallel. Each
+        # paragraph gets the dense id of its distinct group, so results are
+        # fetched by list index rather than by re-hashing the text tuples.
+        group_ids: Dict[tuple[str, ...], int] = {}
+        ids = [group_ids.setdefault(texts, len(group_ids)) for texts in text_groups]
+
+        translated_groups = await self._translate_texts(
+            list(group_ids),
+            target_language,
+            progress_callback
+        )
+
+        # Write translations into the runs they came from
+        for group_id, runs in zip(ids, run_groups):
+            for run, translated in zip(runs, translated_groups[group_id]):
+                run['text'] = translated
+
+        # Refresh the derived paragraph/cell texts
+        for element in elements:
+            self._refresh_text(element)
 
         if progress_callback:
             await progress_callback(100)
 
         return {
-            'elements': translated_elements,
+            'elements': elements,
             'has_images': document_data.get('has_images', False)
         }
 
     def _collect_text_items(
         self,
         element: Dict[str, Any],
-        elem_idx: int
-    ) -> List[tuple[str, Dict[str, Any]]]:
+        text_groups: List[tuple[str, ...]],
+        run_groups: List[List[Dict[str, Any]]]
+    ) -> None:
         """
         Collect all translatable text items from an element.
 
-        Returns:
-            List of (text, metadata) tuples
+        For every paragraph with text, appends its non-empty (stripped) run
+        texts to ``text_groups`` and the matching run dicts to ``run_groups``.
+        The loader's output isn't reused after translation, so runs are
+        updated in place rather than copied.
         """
-        items = []
         element_type = element.get('type')
 
         if element_type == 'paragraph':
-            # Collect text from each run
-            for run_idx, run in enumerate(element.get('runs', [])):
-                text = run.get('text', '').strip()
-                if text:
-                    metadata = {
-                        'elem_idx': elem_idx,
-                        'elem_type': 'paragraph',
-                        'run_idx': run_idx,
-                    }
-                    items.append((text, metadata))
-
+            paragraphs = (element,)
         elif element_type == 'table':
-            # Collect text from each table cell
-            for row_idx, row in enumerate(element.get('rows', [])):
-                for col_idx, cell in enumerate(row):
-                    for para_idx, para in enumerate(cell.get('paragraphs', [])):
-                        for run_idx, run in enumerate(para.get('runs', [])):
-                            text = run.get('text', '').strip()
-                            if text:
-                                metadata = {
-                                    'elem_idx': elem_idx,
-                                    'elem_type': 'table',
-                                    'row_idx': row_idx,
-                                    'col_idx': col_idx,
-                                    'para_idx': para_idx,
-                                    'run_idx': run_idx,
-                                }
-                                items.append((text, metadata))
-
-        return items
-
-    def _apply_translations(
-        self,
-        element: Dict[str, Any],
-        elem_idx: int,
-        translations_map: Dict[str, str]
-    ) -> Dict[str, Any]:
-        """Apply translations back to the element structure."""
+            paragraphs = (
+                para
+                for row in element.get('rows', [])
+                for cell in row
+                for para in cell.get('paragraphs', [])
+            )
+        else:
+            return
+
+        for para in paragraphs:
+            texts = []
+            runs = []
+            for run in para.get('runs', []):
+                text = run.get('text', '')
+                # isspace() checks blank runs without allocating a stripped copy
+                if text and not text.isspace():
+                    texts.append(text.strip())
+                    runs.append(run)
+
+            if texts:
+                text_groups.append(tuple(texts))
+                run_groups.append(runs)
+
+    def _refresh_text(self, element: Dict[str, Any]) -> None:
+        """Recompute paragraph and cell texts from their (translated) runs."""
         element_type = element.get('type')
-        translated_element = element.copy()
 
         if element_type == 'paragraph':
-            # Apply translations to runs
-            translated_runs = []
-            for run_idx, run in enumerate(element.get('runs', [])):
-                translated_run = run.copy()
-                metadata = {
-                    'elem_idx': elem_idx,
-                    'elem_type': 'paragraph',
-                    'run_idx': run_idx,
-                }
-                key = self._make_key(metadata)
-
-                if key in translations_map:
-                    translated_run['text'] = translations_map[key]
-
-                translated_runs.append(translated_run)
-
-            translated_element['runs'] = translated_runs
-            # Update paragraph text as well
-            translated_element['text'] = ''.join(r['text'] for r in translated_runs)
+            element['text'] = ''.join(map(_run_text, element.get('runs', [])))
 
         elif element_type == 'table':
-            # Apply translations to table cells
-            translated_rows = []
-
-            for row_idx, row in enumerate(element.get('rows', [])):
-                translated_row = []
-
-                for col_idx, cell in enumerate(row):
-                    translated_cell = cell.copy()
-                    translated_paragraphs = []
-
-                    for para_idx, para in enumerate(cell.get('paragraphs', [])):
-                        translated_para = para.copy()
-                        translated_runs = []
-
-                        for run_idx, run in enumerate(para.get('runs', [])):
-                            translated_run = run.copy()
-                            metadata = {
-                                'elem_idx': elem_idx,
-                                'elem_type': 'table',
-                                'row_idx': row_idx,
-                                'col_idx': col_idx,
-                                'para_idx': para_idx,
-                                'run_idx': run_idx,
-                            }
-                            key = self._make_key(metadata)
-
-                            if key in translations_map:
-                                translated_run['text'] = translations_map[key]
-
-                            translated_runs.append(translated_run)
-
-                        translated_para['runs'] = translated_runs
-                        translated_para['text'] = ''.join(r['text'] for r in translated_runs)
-                        translated_paragraphs.append(translated_para)
-
-                    translated_cell['paragraphs'] = translated_paragraphs
-                    # Update combined cell text
-                    translated_cell['text'] = '\n'.join(p['text'] for p in translated_paragraphs)
-                    translated_row.append(translated_cell)
-
-                translated_rows.append(translated_row)
-
-            translated_element['rows'] = translated_rows
+            for row in element.get('rows', []):
+                for cell in row:
+                    paragraphs = cell.get('paragraphs', [])
+                    for para in paragraphs:
+                        para['text'] = ''.join(map(_run_text, para.get('runs', [])))
 
-        return translated_element
-
-    def _make_key(self, metadata: Dict[str, Any]) -> str:
-        """Create a unique key for a text item."""
-        if metadata['elem_type'] == 'paragraph':
-            return f"elem_{metadata['elem_idx']}_run_{metadata['run_idx']}"
-        elif metadata['elem_type'] == 'table':
-            return (
-                f"elem_{metadata['elem_idx']}_"
-                f"cell_{metadata['row_idx']}_{metadata['col_idx']}_"
-                f"para_{metadata['para_idx']}_run_{metadata['run_idx']}"
-            )
-        return ""
+                    # Update combined cell text
+                    cell['text'] = '\n'.join(map(_run_text, paragraphs))
 
-    async def _translate_text_with_progress(
+    async def _translate_texts(
         self,
-        text: str,
+        groups: List[tuple[str, ...]],
         target_language: str,
-        index: int,
-        total: int,
         progress_callback: Callable[[int], Awaitable[None]] | None
-    ) -> str:
-        """Translate a single text item with progress tracking."""
-        async with self.semaphore:
-            translated = await translation.translate_text(text, target_language)
+    ) -> List[List[str]]:
+        """
+        Translate paragraph run groups, one result list per group.
 
-            if progress_callback:
-                progress = 10 + int((index + 1) / total * 85)
-                await progress_callback(progress)
+        Multi-run groups go through translation.translate_batch, which sends the
+        runs as one separator-joined request and falls back to per-run calls if
+        the model doesn't return the same number of segments.
 
-            return translated
+        Groups are translated by translation.map_with_workers, so only
+        ``max_concurrency`` coroutines exist at a time (instead of one per group).
+        """
+        async def translate_group(texts: tuple[str, ...]) -> List[str]:
+            async with self.semaphore:
+                if len(texts) == 1:
+                    return [await translation.translate_text(texts[0], target_language)]
+                return await translation.translate_batch(list(texts), target_language)
+
+        return await translation.map_with_workers(
+            groups,
+            translate_group,
+            self.max_concurrency,
+            progress_callback,
+            lambda done, total: 10 + int(done / total * 85)  # 10-95%
+        )
@@ -1,15 +1,42 @@
 """
 DOCX Writer - Preserves document structure, formatting, and metadata
 """
+import functools
 import tempfile
+from binascii import unhexlify
 from copy import deepcopy
 from typing import Dict, Any, List
 from docx import Document
 from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
 from docx.oxml.table import CT_Tbl
 from docx.oxml.text.paragraph import CT_P
 
+# Clark-notation tags for direct lxml iteration (no per-call XPath evaluation)
+_T_TAG = qn('w:t')
+_R_TAG = qn('w:r')
+_DRAWING_TAG = qn('w:drawing')
+_PICT_TAG = qn('w:pict')
+
+
+@functools.lru_cache(maxsize=256)
+def _rgb(hex6: str) -> RGBColor | None:
+    """Parse an "RRGGBB" color; documents reuse a small palette, so results are cached."""
+    if len(hex6) < 6:
+        return None
+    try:
+        r, g, b = unhexlify(hex6)
+    except ValueError:  # binascii.Error is a ValueError subclass
+        return None
+    return RGBColor(r, g, b)
+
+
+@functools.lru_cache(maxsize=64)
+def _pt(size: float) -> Pt:
+    """Font size in points as a Length; a document uses only a few distinct sizes."""
+    return Pt(size)
+
 
 class DocxWriter:
     """
@@ -35,36 +62,33 @@ class DocxWriter:
         doc = Document(original_path)
         body = doc.element.body
 
-        # Preserve original ordering (including media) by cloning elements
-        original_elements = [deepcopy(element) for element in body]
-
-        # Clear body content so we can rebuild deterministically
-        for element in list(body):
-            body.remove(element)
-
         elements = document_data.get('elements', [])
         elem_idx = 0
 
-        for original_element in original_elements:
+        # Single pass in document order: translated paragraphs/tables are built,
+        # moved into the original element's position, and the original dropped.
+        # Everything else (media, section properties, ...) is left in place.
+        for original_element in list(body):
+            replacement = None
+
             if isinstance(original_element, CT_P):
                 if self._paragraph_has_text(original_element):
                     if elem_idx < len(elements) and elements[elem_idx].get('type') == 'paragraph':
                         media_runs = self._extract_media_runs(original_element)
-                        self._add_paragraph(doc, elements[elem_idx], media_runs)
+                        replacement = self._add_paragraph(doc, elements[elem_idx], media_runs)._p
                         elem_idx += 1
-                    else:
-                        body.append(original_element)
-                else:
-                    body.append(original_element)
             elif isinstance(original_element, CT_Tbl):
                 if elem_idx < len(elements) and elements[elem_idx].get('type') == 'table':
-                    self._add_table(doc, elements[elem_idx])
+                    table = self._add_table(doc, elements[elem_idx])
+                    replacement = table._tbl if table is not None else None
                     elem_idx += 1
-                else:
-                    body.append(original_element)
-            else:
-                # Non-text elements (pictures, drawings, etc.) are appended as-is
-                body.append(original_element)
+                    if replacement is None:
+                        body.remove(original_element)
+
+            if replacement is not None:
+                # lxml moves (not copies) a node that is inserted elsewhere
+                original_element.addprevious(replacement)
+                body.remove(original_element)
 
         # Append any leftover translated elements (should rarely happen)
         while elem_idx < len(elements):
@@ -83,7 +107,7 @@ class DocxWriter:
         return output_path
 
     def _add_paragraph(self, doc: Document, para_data: Dict[str, Any], media_runs: List | None = None):
-        """Add a paragraph with formatting."""
+        """Add a paragraph with formatting and return it."""
         paragraph = doc.add_paragraph()
 
         # Set paragraph style if available
@@ -119,20 +143,13 @@ class DocxWriter:
 
                 # Font size
                 if run_data.get('font_size'):
-                    run.font.size = Pt(run_data['font_size'])
+                    run.font.size = _pt(run_data['font_size'])
 
                 # Font color
                 if run_data.get('font_color'):
-                    try:
-                        color_str = run_data['font_color']
-                        # Parse RGB color (format: "RRGGBB")
-                        if len(color_str) >= 6:
-                            r = int(color_str[0:2], 16)
-                            g = int(color_str[2:4], 16)
-                            b = int(color_str[4:6], 16)
-                            run.font.color.rgb = RGBColor(r, g, b)
-                    except:
-                        pass  # Skip if color parsing fails
+                    rgb = _rgb(str(run_data['font_color'])[:6])
+                    if rgb is not None:
+                        run.font.color.rgb = rgb
         else:
             paragraph.add_run(para_data.get('text', ''))
 
@@ -140,13 +157,15 @@ class DocxWriter:
             for media_run in media_runs:
                 paragraph._p.append(media_run)
 
+        return paragraph
+
     def _add_table(self, doc: Document, table_data: Dict[str, Any]):
-        """Add a table with structure and formatting."""
+        """Add a table with structure and formatting and return it (None if empty)."""
         num_rows = table_data.get('num_rows', 0)
         num_cols = table_data.get('num_cols', 0)
 
         if num_rows == 0 or num_cols == 0:
-            return
+            return None
 
         # Create table
         table = doc.add_table(rows=num_rows, cols=num_cols)
@@ -196,27 +215,26 @@ class DocxWriter:
                                 if run_data.get('font_name'):
                                     run.font.name = run_data['font_name']
                                 if run_data.get('font_size'):
-                                    run.font.size = Pt(run_data['font_size'])
+                                    run.font.size = _pt(run_data['font_size'])
                         else:
                             paragraph.add_run(para_data.get('text', ''))
                 else:
                     # Fallback: just add cell text
                     cell.text = cell_data.get('text', '')
 
+        return table
+
     def _paragraph_has_text(self, paragraph_element: CT_P) -> bool:
         """Check if a paragraph originally contained text (matches loader logic)."""
-        text_nodes = paragraph_element.xpath('.//w:t')
-        return any((t.text or '').strip() for t in text_nodes)
+        # iter() walks the subtree in C and any() stops at the first hit
+        return any(t.text and not t.text.isspace() for t in paragraph_element.iter(_T_TAG))
 
     def _extract_media_runs(self, paragraph_element: CT_P) -> List:
         """Clone runs containing drawings or pictures so they can be re-attached."""
         media_runs: List = []
 
-        for run in paragraph_element.xpath('.//w:r'):
-            has_drawing = bool(run.xpath('.//w:drawing'))
-            has_picture = bool(run.xpath('.//w:pict'))
-
-            if has_drawing or has_picture:
+        for run in paragraph_element.iter(_R_TAG):
+            if next(run.iter(_DRAWING_TAG, _PICT_TAG), None) is not None:
                 media_runs.append(deepcopy(run))
 
         return media_runs
@@ -3,8 +3,10 @@ Format Converter - Convert documents to PDF format
 """
 import re
 import tempfile
-import fitz  # PyMuPDF
 from docx import Document
+from docx.oxml.ns import qn
+from docx.table import Table as DocxTable
+from docx.text.paragraph import Paragraph as DocxParagraph
 from pptx import Presentation
 from odf import text as odf_text
 from odf.opendocument import load as odf_load
@@ -13,6 +15,14 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Paragraph, PageBreak, Table, TableStyle
 from reportlab.lib import colors
 
+# Strips any markup left in an ODT paragraph's string form
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# WordprocessingML tags, compared as plain strings while walking the DOCX body
+_P_TAG = qn('w:p')
+_TBL_TAG = qn('w:tbl')
+_T_TAG = qn('w:t')
+
 
 class FormatConverter:
     """Convert various document formats to PDF."""
@@ -33,25 +43,32 @@ class FormatConverter:
         styles = getSampleStyleSheet()
         story = []
 
-        # Convert paragraphs
-        for para in doc.paragraphs:
-            if para.text.strip():
-                story.append(Paragraph(para.text, styles['Normal']))
-
-        # Convert tables
-        for table in doc.tables:
-            table_data = []
-            for row in table.rows:
-                row_data = [cell.text for cell in row.cells]
-                table_data.append(row_data)
-
-            if table_data:
-                t = Table(table_data)
-                t.setStyle(TableStyle([
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                ]))
-                story.append(t)
+        normal_style = styles['Normal']
+        table_style = TableStyle([
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ])
+
+        # Convert paragraphs and tables in one pass over the body, in document order
+        for element in doc.element.body.iterchildren():
+            tag = element.tag
+
+            if tag == _P_TAG:
+                para_text = DocxParagraph(element, doc).text
+                if para_text.strip():
+                    story.append(Paragraph(para_text, normal_style))
+
+            elif tag == _TBL_TAG:
+                # row.cells resolves merged cells, so rows stay rectangular
+                table_data = [
+                    [FormatConverter._cell_text(cell) for cell in row.cells]
+                    for row in DocxTable(element, doc).rows
+                ]
+
+                if table_data:
+                    t = Table(table_data)
+                    t.setStyle(table_style)
+                    story.append(t)
 
         if not story:
             story.append(Paragraph("(empty document)", styles['Normal']))
@@ -59,11 +76,19 @@ class FormatConverter:
         pdf_doc.build(story)
         return output_path
 
+    @staticmethod
+    def _cell_text(cell) -> str:
+        """Join a table cell's paragraph texts straight from the XML."""
+        return '\n'.join(
+            ''.join(t.text or '' for t in p.iter(_T_TAG))
+            for p in cell._tc.iterchildren(_P_TAG)
+        )
+
     @staticmethod
     def pptx_to_pdf(pptx_path: str) -> str:
         """
         Convert PPTX to PDF.
-        Uses PyMuPDF to create PDF from slide images.
+        Renders slide text with ReportLab.
         """
         prs = Presentation(pptx_path)
 
@@ -71,35 +96,41 @@ class FormatConverter:
         with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
             output_path = tmp.name
 
-        pdf_doc = fitz.open()
-
         # For now, we'll create a simple text-based PDF from slides
         # A full implementation would render slides as images
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet
-
         doc = SimpleDocTemplate(output_path, pagesize=A4)
         styles = getSampleStyleSheet()
         story = []
 
-        for slide_idx, slide in enumerate(prs.slides):
+        heading_style = styles['Heading1']
+        normal_style = styles['Normal']
+
+        # len(prs.slides) walks the slide id list, so look it up once
+        slides = prs.slides
+        last_idx = len(slides) - 1
+
+        for slide_idx, slide in enumerate(slides):
             # Add slide number
-            story.append(Paragraph(f"<b>Slide {slide_idx + 1}</b>", styles['Heading1']))
+            story.append(Paragraph(f"<b>Slide {slide_idx + 1}</b>", heading_style))
 
-            # Extract text from shapes
+            # Extract text from shapes, one flowable per text-frame paragraph
             for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text.strip():
-                    story.append(Paragraph(shape.text, styles['Normal']))
-
-            if slide_idx < len(prs.slides) - 1:
+                if not shape.has_text_frame:
+                    continue
+                for para in shape.text_frame.paragraphs:
+                    para_text = ''.join(run.text for run in para.runs)
+                    if para_text.strip():
+                        story.append(Paragraph(para_text, normal_style))
+
+            if slide_idx < last_idx:
                 story.append(PageBreak())
 
         if not story:
             story.append(Paragraph("(empty presentation)", styles['Normal']))
 
+        # build() deletes each flowable from the story as it is laid out,
+        # so the list shrinks while pages are written
         doc.build(story)
-        pdf_doc.close()
 
         return output_path
 
@@ -117,8 +148,7 @@ class FormatConverter:
         story = []
 
         for para in paragraphs:
-            para_str = str(para)
-            cleaned = re.sub(r'<[^>]+>', '', para_str).strip()
+            cleaned = _TAG_RE.sub('', str(para)).strip()
             if cleaned:
                 story.append(Paragraph(cleaned, styles['Normal']))
 
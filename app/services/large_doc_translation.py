@@ -8,12 +8,16 @@ Handles documents that exceed context window limits through:
 4. Optional hierarchical translation for very large docs
 """
 import asyncio
-from typing import List, Callable, Awaitable, Optional
+import os
+from typing import IO, List, Callable, Awaitable, Optional
 from app.services import chunker, translation
 from app.core.logging import get_logger
 
 logger = get_logger("LargeDocTranslation")
 
+# Parallel chunk translations per document (same knob as the orchestrator's page concurrency)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("STARK_PAGE_CONCURRENCY", "5"))
+
 
 class LargeDocumentTranslator:
     """
@@ -26,8 +30,17 @@ class LargeDocumentTranslator:
     4. Quality preservation through overlap blending
     """
 
-    def __init__(self, max_concurrency: int = 5):
-        self.semaphore = asyncio.Semaphore(max_concurrency)
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        semaphore: asyncio.Semaphore | None = None,
+        batch_size: int = 3
+    ):
+        # Pass the orchestrator's semaphore so every workflow shares one admission limit
+        self.semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+        # Chunks translated in parallel per context step: larger is faster, smaller more coherent
+        self.batch_size = batch_size
+        self._completed_chunks = 0
 
     async def translate_large_text(
         self,
@@ -36,7 +49,9 @@ class LargeDocumentTranslator:
         max_tokens: int = 6000,
         overlap_tokens: int = 200,
         progress_callback: Optional[Callable[[int], Awaitable[None]]] = None,
-        use_context: bool = True
+        use_context: bool = True,
+        use_batch_api: bool = False,
+        output_stream: Optional[IO[str]] = None
     ) -> str:
         """
         Translate large text with intelligent chunking.
@@ -48,12 +63,17 @@ class LargeDocumentTranslator:
             overlap_tokens: Tokens to overlap between chunks
             progress_callback: Optional progress callback
             use_context: Whether to pass previous chunk as context
+            use_batch_api: Translate through the OpenAI Batch API (no context)
+            output_stream: If given, translated chunks are written to it in
+                document order as soon as they are ready, instead of being
+                held until the end and joined
 
         Returns:
-            Translated text with coherence preserved
+            Translated text with coherence preserved ("" when streaming)
         """
-        # Get chunks with metadata
-        chunks_data = chunker.chunk_text_with_metadata(
+        # Get chunks with metadata (regex-heavy over the whole document, so off the event loop)
+        chunks_data = await asyncio.to_thread(
+            chunker.chunk_text_with_metadata,
             text,
             max_tokens=max_tokens,
             overlap_tokens=overlap_tokens
@@ -73,13 +93,24 @@ class LargeDocumentTranslator:
         if progress_callback:
             await progress_callback(5)
 
+        self._completed_chunks = 0
+
         # Translate chunks with context awareness
-        if use_context:
+        if use_batch_api:
+            # Batch jobs are independent requests, so no context is passed
+            translated_chunks = await translation.translate_via_batch_api(
+                [chunk_data['text_core'] for chunk_data in chunks_data],
+                target_language
+            )
+            if output_stream is not None:
+                output_stream.writelines(translated_chunks)
+        elif use_context:
             translated_chunks = await self._translate_with_context(
                 chunks_data,
                 target_language,
                 total_chunks,
-                progress_callback
+                progress_callback,
+                output_stream
             )
         else:
             # Parallel translation without context (faster but may lose coherence)
@@ -87,15 +118,20 @@ class LargeDocumentTranslator:
                 chunks_data,
                 target_language,
                 total_chunks,
-                progress_callback
+                progress_callback,
+                output_stream
             )
 
-        # Merge chunks, removing overlaps
-        final_text = self._merge_chunks(translated_chunks, chunks_data)
-
         if progress_callback:
             await progress_callback(100)
 
+        if output_stream is not None:
+            logger.info(f"Large document translation complete: {total_chunks} chunks streamed")
+            return ""
+
+        # Merge chunks, removing overlaps
+        final_text = self._merge_chunks(translated_chunks, chunks_data)
+
         logger.info(f"Large document translation complete: {len(final_text)} chars")
 
         return final_text
@@ -105,54 +141,51 @@ class LargeDocumentTranslator:
         chunks_data: List[dict],
         target_language: str,
         total_chunks: int,
-        progress_callback: Optional[Callable[[int], Awaitable[None]]]
+        progress_callback: Optional[Callable[[int], Awaitable[None]]],
+        output_stream: Optional[IO[str]] = None
     ) -> List[str]:
         """
         Translate chunks sequentially with context from previous chunk.
 
         This preserves better coherence but is slower (sequential).
         For very large documents, we still batch process in groups.
+        With ``output_stream``, each batch is written out as it finishes and
+        an empty list is returned.
         """
         translated_chunks = []
         previous_translation = ""
 
-        # Process in small batches to balance coherence and speed
-        batch_size = 3  # Process 3 chunks in parallel, then use last as context
+        # Process in small batches to balance coherence and speed: translate
+        # batch_size chunks in parallel, then use the last as context
+        batch_size = self.batch_size
 
         for batch_start in range(0, total_chunks, batch_size):
             batch_end = min(batch_start + batch_size, total_chunks)
             batch = chunks_data[batch_start:batch_end]
 
+            # Limited context from the previous translation (last 200 chars),
+            # built once per batch and sent beside the chunk, not glued into it
+            context = previous_translation[-200:] if previous_translation else None
+
             # Translate batch in parallel
             batch_tasks = []
-            for chunk_data in batch:
-                # Include limited context from previous translation
-                context_hint = ""
-                if previous_translation and chunk_data.get('has_overlap'):
-                    # Use last 200 chars of previous translation as hint
-                    context_hint = (
-                        f"\n\n[Previous context for coherence: "
-                        f"...{previous_translation[-200:]}]\n\n"
-                    )
-
-                # Remove overlap from current chunk (it's already in context)
-                chunk_text = chunk_data['text']
-                if chunk_data.get('has_overlap') and chunk_data.get('previous_context'):
-                    overlap = chunk_data['previous_context']
-                    if chunk_text.startswith(overlap):
-                        chunk_text = chunk_text[len(overlap):]
-
+            for offset, chunk_data in enumerate(batch):
+                # Translate without the overlap (it's already in context)
                 task = self._translate_chunk_with_progress(
-                    context_hint + chunk_text,
+                    chunk_data['text_core'],
                     target_language,
-                    batch_start + batch.index(chunk_data),
+                    batch_start + offset,
                     total_chunks,
-                    progress_callback
+                    progress_callback,
+                    context=context if chunk_data.get('has_overlap') else None
                 )
                 batch_tasks.append(task)
 
-            batch_results = await asyncio.gather(*batch_tasks)
-            translated_chunks.extend(batch_results)
+            batch_results = [translated for _, translated in await asyncio.gather(*batch_tasks)]
+            if output_stream is not None:
+                output_stream.writelines(batch_results)
+            else:
+                translated_chunks.extend(batch_results)
 
             # Update previous translation for next batch
             if batch_results:
@@ -165,23 +198,23 @@ class LargeDocumentTranslator:
         chunks_data: List[dict],
         target_language: str,
         total_chunks: int,
-        progress_callback: Optional[Callable[[int], Awaitable[None]]]
+        progress_callback: Optional[Callable[[int], Awaitable[None]]],
+        output_stream: Optional[IO[str]] = None
     ) -> List[str]:
         """
         Translate all chunks in parallel (faster but may lose some coherence).
+
+        Results are slotted into place as they complete, so progress follows
+        completion order instead of waiting on the slowest chunk. With
+        ``output_stream``, completed chunks are held only until every earlier
+        chunk has been written, and an empty list is returned.
         """
         tasks = []
 
         for chunk_data in chunks_data:
-            # Remove overlap since we're not using context
-            chunk_text = chunk_data['text']
-            if chunk_data.get('has_overlap') and chunk_data.get('previous_context'):
-                overlap = chunk_data['previous_context']
-                if chunk_text.startswith(overlap):
-                    chunk_text = chunk_text[len(overlap):]
-
+            # Translate without the overlap since we're not using context
             task = self._translate_chunk_with_progress(
-                chunk_text,
+                chunk_data['text_core'],
                 target_language,
                 chunk_data['index'],
                 total_chunks,
@@ -189,7 +222,24 @@ class LargeDocumentTranslator:
             )
             tasks.append(task)
 
-        return await asyncio.gather(*tasks)
+        if output_stream is not None:
+            # Reorder buffer: chunk index -> translation waiting on an earlier chunk
+            pending: dict[int, str] = {}
+            next_index = 0
+            for next_done in asyncio.as_completed(tasks):
+                index, translated = await next_done
+                pending[index] = translated
+                while next_index in pending:
+                    output_stream.write(pending.pop(next_index))
+                    next_index += 1
+            return []
+
+        translated_chunks: List[str] = [""] * len(tasks)
+        for next_done in asyncio.as_completed(tasks):
+            index, translated = await next_done
+            translated_chunks[index] = translated
+
+        return translated_chunks
 
     async def _translate_chunk_with_progress(
         self,
@@ -197,17 +247,19 @@ class LargeDocumentTranslator:
         target_language: str,
         index: int,
         total: int,
-        progress_callback: Optional[Callable[[int], Awaitable[None]]]
-    ) -> str:
-        """Translate a single chunk with progress tracking."""
+        progress_callback: Optional[Callable[[int], Awaitable[None]]],
+        context: Optional[str] = None
+    ) -> tuple[int, str]:
+        """Translate a single chunk with progress tracking; returns (index, translation)."""
         async with self.semaphore:
-            translated = await translation.translate_text(text, target_language)
+            translated = await translation.translate_text(text, target_language, context=context)
 
-            if progress_callback:
-                progress = 5 + int((index + 1) / total * 90)
-                await progress_callback(progress)
+        self._completed_chunks += 1
+        if progress_callback:
+            progress = 5 + int(self._completed_chunks / total * 90)
+            await progress_callback(progress)
 
-            return translated
+        return index, translated
 
     def _merge_chunks(
         self,
@@ -229,7 +281,10 @@ async def translate_large_document(
     text: str,
     target_language: str,
     progress_callback: Optional[Callable[[int], Awaitable[None]]] = None,
-    use_context: bool = True
+    use_context: bool = True,
+    use_batch_api: bool = False,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    output_stream: Optional[IO[str]] = None
 ) -> str:
     """
     Translate a large document with smart chunking.
@@ -239,11 +294,14 @@ async def translate_large_document(
         target_language: Target language
         progress_callback: Optional progress callback
         use_context: Whether to use context-aware translation (slower but better)
+        use_batch_api: Whether to use the OpenAI Batch API (cheaper, high latency)
+        semaphore: Shared concurrency limit (defaults to a private one)
+        output_stream: Write the translation here as it is produced instead of returning it
 
     Returns:
-        Translated text
+        Translated text ("" when output_stream is given)
     """
-    translator = LargeDocumentTranslator()
+    translator = LargeDocumentTranslator(semaphore=semaphore)
 
     return await translator.translate_large_text(
         text,
@@ -251,5 +309,7 @@ async def translate_large_document(
         max_tokens=6000,  # Conservative for GPT-4
         overlap_tokens=200,
         progress_callback=progress_callback,
-        use_context=use_context
+        use_context=use_context,
+        use_batch_api=use_batch_api,
+        output_stream=output_stream
     )
@@ -1,4 +1,6 @@
 
+import functools
+import os
 from abc import ABC, abstractmethod
 import fitz  # PyMuPDF
 
@@ -9,27 +11,108 @@ class Loader(ABC):
 
 class PdfLoader(Loader):
     def load(self, file_path: str) -> list[str]:
-        doc = fitz.open(file_path)
-        pages = []
-        for page in doc:
-            pages.append(page.get_text())
-        return pages
+        # PyMuPDF holds the GIL and isn't thread-safe, so pages are read in one
+        # thread; the context manager releases the document right away
+        with fitz.open(file_path) as doc:
+            return [page.get_text() for page in doc]
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY, _W_P, _W_T = f"{_W_NS}body", f"{_W_NS}p", f"{_W_NS}t"
+_W_R, _W_HYPERLINK, _W_BR = f"{_W_NS}r", f"{_W_NS}hyperlink", f"{_W_NS}br"
+_W_BR_TYPE = f"{_W_NS}type"
+# Other run content that python-docx's run.text renders as characters
+_W_RUN_TEXT = {
+    f"{_W_NS}tab": "\t",
+    f"{_W_NS}ptab": "\t",
+    f"{_W_NS}cr": "\n",
+    f"{_W_NS}noBreakHyphen": "-",
+}
+
+
+def _docx_run_text(run) -> str:
+    """Text of a w:r element, rendered like python-docx's run.text."""
+    parts = []
+    for node in run.iterchildren():
+        tag = node.tag
+        if tag == _W_T:
+            parts.append(node.text or "")
+        elif tag == _W_BR:
+            # Only line breaks are text; page and column breaks render as ""
+            if node.get(_W_BR_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            parts.append(_W_RUN_TEXT.get(tag, ""))
+    return "".join(parts)
+
+
+def _docx_paragraph_text(p) -> str:
+    """
+    Text of a w:p element, rendered like python-docx's paragraph.text.
+
+    Only the paragraph's own runs (direct children and hyperlink runs) count:
+    w:pPr tab stops, text boxes and mc:AlternateContent fallbacks nested
+    inside a run are not paragraph text.
+    """
+    parts = []
+    for child in p.iterchildren(_W_R, _W_HYPERLINK):
+        if child.tag == _W_R:
+            parts.append(_docx_run_text(child))
+        else:
+            parts.extend(_docx_run_text(run) for run in child.iterchildren(_W_R))
+    return "".join(parts)
+
 
 class DocxLoader(Loader):
     def load(self, file_path: str) -> list[str]:
+        try:
+            text = self._load_body_text(file_path)
+        except Exception:
+            # Unusual packages (e.g. a renamed main part): let python-docx resolve them
+            text = self._load_with_python_docx(file_path)
+
+        # Extract all paragraphs as a single page
+        return [text] if text else [""]
+
+    def _load_body_text(self, file_path: str) -> str:
+        """
+        Stream word/document.xml with lxml and join the body paragraphs' text.
+
+        Same text as python-docx's doc.paragraphs, without building the
+        Document object graph. Every paragraph (including table cell and text
+        box paragraphs) is cleared once parsed, and body children that have
+        been read are removed from w:body, so memory stays bounded by the
+        largest single body element.
+        """
+        import zipfile
+        from lxml import etree
+
+        paragraphs = []
+        with zipfile.ZipFile(file_path) as package, package.open("word/document.xml") as xml:
+            for _, p in etree.iterparse(xml, events=("end",), tag=_W_P):
+                parent = p.getparent()
+                # Table cell / text box paragraphs aren't in doc.paragraphs
+                if parent is not None and parent.tag == _W_BODY:
+                    paragraphs.append(_docx_paragraph_text(p))
+                    # Drop the paragraphs and tables already read
+                    while p.getprevious() is not None:
+                        del parent[0]
+                p.clear()
+
+        return "\n".join(paragraphs)
+
+    def _load_with_python_docx(self, file_path: str) -> str:
         try:
             from docx import Document
         except ImportError:
             raise ImportError("python-docx is required for DOCX files. Install it with: pip install python-docx")
 
         doc = Document(file_path)
-        # Extract all paragraphs as a single page
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return [text] if text else [""]
+        return "\n".join([paragraph.text for paragraph in doc.paragraphs])
 
 class OdtLoader(Loader):
     def load(self, file_path: str) -> list[str]:
         try:
+            from odf import teletype
             from odf import text as odf_text
             from odf.opendocument import load as odf_load
         except ImportError:
@@ -37,10 +120,9 @@ class OdtLoader(Loader):
 
         doc = odf_load(file_path)
         paragraphs = doc.getElementsByType(odf_text.P)
-        text = "\n".join([str(p) for p in paragraphs])
-        # Clean up XML tags
-        import re
-        text = re.sub(r'<[^>]+>', '', text)
+        # extractText walks the text nodes (spans, tabs, spaces, line breaks)
+        # directly, so there is no markup to strip afterwards
+        text = "\n".join(teletype.extractText(p) for p in paragraphs)
         return [text] if text else [""]
 
 class TextLoader(Loader):
@@ -70,24 +152,30 @@ class PptxLoader(Loader):
         return pages
 
     def _extract_text_from_shape(self, shape_data: dict) -> str:
-        """Extract plain text from shape (recursive for groups)."""
-        shape_type = shape_data.get('type')
-
-        if shape_type == 'text':
-            paragraphs = shape_data.get('paragraphs', [])
-            return '\n'.join(p.get('text', '') for p in paragraphs)
-        elif shape_type == 'table':
-            table_data = shape_data.get('table_data', {})
-            rows = table_data.get('rows', [])
-            return '\n'.join(
-                '\t'.join(cell.get('text', '') for cell in row)
-                for row in rows
-            )
-        elif shape_type == 'group':
-            sub_shapes = shape_data.get('shapes', [])
-            return '\n'.join(self._extract_text_from_shape(s) for s in sub_shapes)
-
-        return ''
+        """Extract plain text from shape (groups are walked with an explicit stack)."""
+        # A group's text is its children's texts joined by newlines, so nested
+        # groups flatten into one ordered list of leaf texts joined once
+        texts = []
+        stack = [shape_data]
+        while stack:
+            shape = stack.pop()
+            shape_type = shape.get('type')
+
+            if shape_type == 'text':
+                texts.append('\n'.join(p.get('text', '') for p in shape.get('paragraphs', [])))
+            elif shape_type == 'table':
+                rows = shape.get('table_data', {}).get('rows', [])
+                texts.append('\n'.join(
+                    '\t'.join(cell.get('text', '') for cell in row)
+                    for row in rows
+                ))
+            elif shape_type == 'group' and shape.get('shapes'):
+                # Reversed so the first sub-shape is popped first
+                stack.extend(reversed(shape['shapes']))
+            else:
+                texts.append('')
+
+        return '\n'.join(texts)
 
 
 class ImageLoader(Loader):
@@ -103,34 +191,45 @@ class ImageLoader(Loader):
         # If it's a regular PDF (not scanned), OCR returns None
         if pages is None:
             # Fall back to regular PDF loading
-            return PdfLoader().load(file_path)
+            return _shared(PdfLoader).load(file_path)
 
         return pages
 
 
+@functools.lru_cache(maxsize=None)
+def _shared(loader_cls: type[Loader]) -> Loader:
+    """Loaders are stateless, so each class is instantiated once and reused."""
+    return loader_cls()
+
+
+def _pdf_loader(file_path: str) -> Loader:
+    """Scanned PDFs go through OCR, text PDFs through PyMuPDF."""
+    from app.services.ocr import get_ocr_service
+
+    if get_ocr_service().is_pdf_scanned(file_path):
+        return _shared(ImageLoader)
+    return _shared(PdfLoader)
+
+
+# Lower-cased extension -> factory taking the file path
+_EXT_TO_LOADER = {
+    '.png': lambda _: _shared(ImageLoader),
+    '.jpg': lambda _: _shared(ImageLoader),
+    '.jpeg': lambda _: _shared(ImageLoader),
+    '.webp': lambda _: _shared(ImageLoader),
+    '.gif': lambda _: _shared(ImageLoader),
+    '.pdf': _pdf_loader,
+    '.docx': lambda _: _shared(DocxLoader),
+    '.odt': lambda _: _shared(OdtLoader),
+    '.txt': lambda _: _shared(TextLoader),
+    '.pptx': lambda _: _shared(PptxLoader),
+}
+
+
 class LoaderFactory:
     @staticmethod
     def get_loader(file_path: str) -> Loader:
-        file_path_lower = file_path.lower()
-
-        # Check for image files first
-        if any(file_path_lower.endswith(ext) for ext in ['.png', '.jpg', '.jpeg', '.webp', '.gif']):
-            return ImageLoader()
-        elif file_path_lower.endswith(".pdf"):
-            # Check if it's a scanned PDF
-            from app.services.ocr import get_ocr_service
-            ocr_service = get_ocr_service()
-            if ocr_service.is_pdf_scanned(file_path):
-                return ImageLoader()
-            else:
-                return PdfLoader()
-        elif file_path_lower.endswith(".docx"):
-            return DocxLoader()
-        elif file_path_lower.endswith(".odt"):
-            return OdtLoader()
-        elif file_path_lower.endswith(".txt"):
-            return TextLoader()
-        elif file_path_lower.endswith(".pptx"):
-            return PptxLoader()
-        else:
+        factory = _EXT_TO_LOADER.get(os.path.splitext(file_path)[1].lower())
+        if factory is None:
             raise ValueError(f"Unsupported file type: {file_path}. Supported formats: PDF, DOCX, ODT, TXT, PPTX, PNG, JPG, JPEG, WEBP, GIF")
+        return factory(file_path)
@@ -3,14 +3,83 @@ OCR Service - Extract text from images and scanned PDFs
 Uses OpenAI Vision API for high-quality text extraction
 """
 import base64
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
 import fitz  # PyMuPDF
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
-from openai import OpenAI
 import os
 from app.core.logging import get_logger
+from app.services.openai_client import SDK_MAX_RETRIES, get_sync_openai_client
 
 logger = get_logger("OCRService")
 
+# Concurrent Vision API requests per scanned PDF
+OCR_MAX_CONCURRENCY = int(os.getenv("OCR_MAX_CONCURRENCY", "8"))
+
+# Rasterization zoom for scanned PDF pages
+_OCR_MATRIX = fitz.Matrix(1.5, 1.5)
+
+# Page OCR results kept in memory (by rendered image hash)
+_PAGE_CACHE_SIZE = 512
+
+# Vision prompts; kept byte-identical across calls so the provider's prompt cache applies
+_IMAGE_PROMPT = (
+    "Extract ALL text from this image. "
+    "Preserve the original formatting, structure, and layout as much as possible. "
+    "Return only the extracted text, nothing else. "
+    "If there are tables, preserve their structure. "
+    "If there are multiple columns, indicate them clearly."
+)
+_SCANNED_PAGE_PROMPT = (
+    "Extract ALL text from this PDF page image. "
+    "Preserve the original formatting, structure, and layout. "
+    "Return only the extracted text, nothing else. "
+    "If there are tables, preserve their structure."
+)
+
+
+def _data_url(mime_type: str, data: bytes) -> str:
+    """Build a base64 data URL, appending the encoding in place and decoding once."""
+    url = bytearray(b"data:%s;base64," % mime_type.encode('ascii'))
+    url += base64.b64encode(data)
+    return url.decode('ascii')
+
+
+@functools.lru_cache(maxsize=512)
+def _is_pdf_scanned_cached(pdf_path: str, mtime_ns: int, size: int) -> bool:
+    """Scan check behind OCRService.is_pdf_scanned; mtime/size make stale entries miss."""
+    try:
+        with fitz.open(pdf_path) as doc:
+            # Check first few pages
+            pages_to_check = min(3, len(doc))
+            text_chars = 0
+
+            for page_num in range(pages_to_check):
+                text_chars += len(doc[page_num].get_text().strip())
+
+                # Enough text for the whole sample already: not scanned, no need
+                # to parse the remaining pages (the common case for text PDFs)
+                if text_chars >= 50 * pages_to_check:
+                    return False
+
+        # If very little text found, likely a scanned PDF
+        # Threshold: < 50 characters per checked page suggests scanned
+        avg_chars_per_page = text_chars / pages_to_check if pages_to_check > 0 else 0
+
+        is_scanned = avg_chars_per_page < 50
+
+        if is_scanned:
+            logger.info(f"PDF detected as scanned (avg {avg_chars_per_page:.1f} chars/page)")
+
+        return is_scanned
+
+    except Exception as e:
+        logger.error(f"Error checking if PDF is scanned: {e}")
+        return False
+
 
 class OCRService:
     """
@@ -23,43 +92,30 @@ class OCRService:
     """
 
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Shared keep-alive pool: concurrent page requests reuse warm connections.
+        # OCR has no retry loop of its own, so it keeps the SDK's retries
+        self.client = get_sync_openai_client().with_options(max_retries=SDK_MAX_RETRIES)
+
+        # OCR text of recent pages keyed by a hash of the rendered page image
+        self._page_cache: OrderedDict[bytes, str] = OrderedDict()
+        self._page_cache_lock = threading.Lock()
 
     def is_pdf_scanned(self, pdf_path: str) -> bool:
         """
         Detect if a PDF is scanned (image-based) or has extractable text.
 
         Returns True if the PDF appears to be scanned (no/minimal text).
+        The result is cached per (path, mtime, size), so the loader dispatch and
+        the OCR step don't both parse the same file.
         """
         try:
-            doc = fitz.open(pdf_path)
-
-            # Check first few pages
-            pages_to_check = min(3, len(doc))
-            text_chars = 0
-
-            for page_num in range(pages_to_check):
-                page = doc[page_num]
-                text = page.get_text().strip()
-                text_chars += len(text)
-
-            doc.close()
-
-            # If very little text found, likely a scanned PDF
-            # Threshold: < 50 characters per checked page suggests scanned
-            avg_chars_per_page = text_chars / pages_to_check if pages_to_check > 0 else 0
-
-            is_scanned = avg_chars_per_page < 50
-
-            if is_scanned:
-                logger.info(f"PDF detected as scanned (avg {avg_chars_per_page:.1f} chars/page)")
-
-            return is_scanned
-
-        except Exception as e:
+            stat = os.stat(pdf_path)
+        except OSError as e:
             logger.error(f"Error checking if PDF is scanned: {e}")
             return False
 
+        return _is_pdf_scanned_cached(pdf_path, stat.st_mtime_ns, stat.st_size)
+
     def extract_text_from_image(self, image_path: str) -> str:
         """
         Extract text from an image file using OpenAI Vision API.
@@ -71,14 +127,14 @@ class OCRService:
             Extracted text
         """
         try:
-            # Read and encode image
-            with open(image_path, "rb") as image_file:
-                image_data = base64.b64encode(image_file.read()).decode('utf-8')
-
             # Determine image type from extension
             ext = image_path.lower().split('.')[-1]
             mime_type = f"image/{ext}" if ext in ['png', 'jpg', 'jpeg', 'webp', 'gif'] else "image/png"
 
+            # Read and encode image
+            with open(image_path, "rb") as image_file:
+                image_url = _data_url(mime_type, image_file.read())
+
             # Use Vision API to extract text
             response = self.client.chat.completions.create(
                 model="gpt-4o",  # or gpt-4-vision-preview
@@ -88,18 +144,12 @@ class OCRService:
                         "content": [
                             {
                                 "type": "text",
-                                "text": (
-                                    "Extract ALL text from this image. "
-                                    "Preserve the original formatting, structure, and layout as much as possible. "
-                                    "Return only the extracted text, nothing else. "
-                                    "If there are tables, preserve their structure. "
-                                    "If there are multiple columns, indicate them clearly."
-                                )
+                                "text": _IMAGE_PROMPT
                             },
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:{mime_type};base64,{image_data}"
+                                    "url": image_url
                                 }
                             }
                         ]
@@ -123,6 +173,10 @@ class OCRService:
         Extract text from a scanned PDF by converting pages to images
         and using OCR.
 
+        Rendering and OCR are pipelined: each page is submitted to the Vision
+        API as soon as it is rasterized, with up to OCR_MAX_CONCURRENCY
+        requests in flight while later pages are still being rendered.
+
         Args:
             pdf_path: Path to scanned PDF file
 
@@ -130,64 +184,94 @@ class OCRService:
             List of extracted text (one per page)
         """
         try:
-            doc = fitz.open(pdf_path)
-            pages_text = []
-
-            logger.info(f"Processing scanned PDF: {len(doc)} pages")
-
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-
-                # Convert page to image
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x zoom for better quality
-
-                # Convert to PNG bytes
-                img_bytes = pix.tobytes("png")
-
-                # Encode to base64
-                img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-
-                # Extract text using Vision API
-                response = self.client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": (
-                                        "Extract ALL text from this PDF page image. "
-                                        "Preserve the original formatting, structure, and layout. "
-                                        "Return only the extracted text, nothing else. "
-                                        "If there are tables, preserve their structure."
-                                    )
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/png;base64,{img_base64}"
-                                    }
-                                }
-                            ]
-                        }
-                    ],
-                    max_tokens=4096
-                )
-
-                page_text = response.choices[0].message.content
-                pages_text.append(page_text)
-
+            page_keys = []
+            # Pages that render byte-identical (blank pages, repeated covers,
+            # re-uploaded scans) are OCR'd once and reuse the cached text
+            texts_by_key = {}
+            pending = {}  # image hash -> Future for pages being OCR'd
+
+            with ThreadPoolExecutor(max_workers=OCR_MAX_CONCURRENCY) as executor:
+                # PyMuPDF isn't thread-safe, so pages are rendered here, in order
+                with fitz.open(pdf_path) as doc:
+                    logger.info(f"Processing scanned PDF: {len(doc)} pages")
+
+                    for page in doc:
+                        # Convert page to image; 1.5x zoom (~108 DPI) is plenty for Vision OCR
+                        pix = page.get_pixmap(matrix=_OCR_MATRIX)
+
+                        # JPEG is several times smaller than PNG for scans, which shrinks
+                        # the base64 payload and upload; drop the pixmap before the next page
+                        jpeg = pix.tobytes("jpeg", jpg_quality=80)
+                        pix = None
+                        key = hashlib.blake2b(jpeg, digest_size=16).digest()
+                        page_keys.append(key)
+
+                        if key in texts_by_key or key in pending:
+                            continue
+
+                        with self._page_cache_lock:
+                            cached = self._page_cache.get(key)
+                            if cached is not None:
+                                self._page_cache.move_to_end(key)
+
+                        if cached is not None:
+                            texts_by_key[key] = cached
+                        else:
+                            pending[key] = executor.submit(
+                                self._extract_text_from_page_image,
+                                _data_url("image/jpeg", jpeg)
+                            )
+
+                for key, future in pending.items():
+                    texts_by_key[key] = future.result()
+
+            if pending:
+                with self._page_cache_lock:
+                    for key in pending:
+                        self._page_cache[key] = texts_by_key[key]
+                        self._page_cache.move_to_end(key)
+                    while len(self._page_cache) > _PAGE_CACHE_SIZE:
+                        self._page_cache.popitem(last=False)
+
+            logger.info(f"OCR requests: {len(pending)} for {len(page_keys)} pages")
+
+            pages_text = [texts_by_key[key] for key in page_keys]
+
+            for page_num, page_text in enumerate(pages_text):
                 logger.info(f"Extracted {len(page_text)} chars from page {page_num + 1}")
 
-            doc.close()
-
             return pages_text
 
         except Exception as e:
             logger.error(f"Error extracting text from scanned PDF: {e}")
             raise
 
+    def _extract_text_from_page_image(self, image_url: str) -> str:
+        """Run Vision OCR on one page image given as a data URL."""
+        response = self.client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": _SCANNED_PAGE_PROMPT
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": image_url
+                            }
+                        }
+                    ]
+                }
+            ],
+            max_tokens=4096
+        )
+
+        return response.choices[0].message.content
+
     def extract_text(self, file_path: str) -> List[str]:
         """
         Smart text extraction that handles both images and PDFs.
@@ -0,0 +1,70 @@
+"""
+Shared OpenAI client
+
+One AsyncOpenAI client (and therefore one keep-alive connection pool) is reused
+by every LLM call in the process, so concurrent chunk translations and
+validations don't pay a TCP + TLS handshake on cold connections. Synchronous
+callers (OCR runs inside the loaders, off the event loop) share one OpenAI
+client with the same pool settings.
+
+The shared clients never retry on their own: translation._run_translator owns
+the retry policy (backoff plus a process-wide circuit breaker), and hidden SDK
+retries would multiply its attempts. Callers without a retry loop of their own
+opt back in with client.with_options(max_retries=SDK_MAX_RETRIES), which keeps
+the same connection pool.
+"""
+import httpx
+from agents import OpenAIProvider, RunConfig
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+# Sized for many parallel chunk calls across concurrent documents
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+# Large-document chunks (~6k tokens) can take minutes to translate
+_HTTP_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+# SDK retries for callers that don't retry themselves (validation, OCR, Batch API)
+SDK_MAX_RETRIES = 2
+
+
+# Singleton instances
+_openai_client = None
+_sync_openai_client = None
+_run_config = None
+_retrying_run_config = None
+
+def get_openai_client() -> AsyncOpenAI:
+    """Get or create the shared AsyncOpenAI client."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        )
+    return _openai_client
+
+
+def get_sync_openai_client() -> OpenAI:
+    """Get or create the shared synchronous OpenAI client."""
+    global _sync_openai_client
+    if _sync_openai_client is None:
+        _sync_openai_client = OpenAI(
+            max_retries=0,
+            http_client=DefaultHttpxClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        )
+    return _sync_openai_client
+
+
+def get_run_config() -> RunConfig:
+    """Get a RunConfig that routes agent runs through the shared client (no SDK retries)."""
+    global _run_config
+    if _run_config is None:
+        _run_config = RunConfig(model_provider=OpenAIProvider(openai_client=get_openai_client()))
+    return _run_config
+
+
+def get_retrying_run_config() -> RunConfig:
+    """Get a RunConfig on the shared pool that keeps the SDK's own retries."""
+    global _retrying_run_config
+    if _retrying_run_config is None:
+        client = get_openai_client().with_options(max_retries=SDK_MAX_RETRIES)
+        _retrying_run_config = RunConfig(model_provider=OpenAIProvider(openai_client=client))
+    return _retrying_run_config
@@ -2,6 +2,7 @@
 PDF Translation with Formatting Preservation
 Preserves layout, images, tables, and styling using PyMuPDF
 """
+import re
 import tempfile
 import shutil
 from typing import List, Dict, Any, Callable, Awaitable
@@ -12,6 +13,44 @@ from app.core.logging import get_logger
 
 logger = get_logger("PdfFormattingService")
 
+# Refusal phrases that mark a translation as unusable, matched in one
+# case-insensitive scan instead of lowercasing and searching per phrase
+_GUARD_PHRASE_RE = re.compile(
+    "|".join(re.escape(phrase) for phrase in (
+        "i'm sorry",
+        "i am sorry",
+        "cannot assist",
+        "can't assist",
+        "not able to help",
+        "i cannot comply",
+    )),
+    re.IGNORECASE,
+)
+
+# Span flag bits set by PyMuPDF's text extraction
+_FLAG_ITALIC = 0x02
+_FLAG_BOLD = 0x10
+
+# Font name keywords that select a built-in family (monospace wins over serif)
+_MONO_FONT_RE = re.compile(r"mono|cour|typewriter")
+_SERIF_FONT_RE = re.compile(r"times|serif|roman")
+
+# (family, bold, italic) -> built-in font name
+_BUILTIN_FONTS = {
+    ("courier", False, False): "courier",
+    ("courier", True, False): "courier-bold",
+    ("courier", False, True): "courier-oblique",
+    ("courier", True, True): "courier-boldoblique",
+    ("times", False, False): "times-roman",
+    ("times", True, False): "times-bold",
+    ("times", False, True): "times-italic",
+    ("times", True, True): "times-bolditalic",
+    ("helvetica", False, False): "helvetica",
+    ("helvetica", True, False): "helvetica-bold",
+    ("helvetica", False, True): "helvetica-oblique",
+    ("helvetica", True, True): "helvetica-boldoblique",
+}
+
 
 class PdfFormattingService:
     """
@@ -23,8 +62,13 @@ class PdfFormattingService:
     - Colors and formatting
     """
 
-    def __init__(self, max_concurrency: int = 5):
-        self.semaphore = asyncio.Semaphore(max_concurrency)
+    def __init__(self, max_concurrency: int = 5, semaphore: asyncio.Semaphore | None = None):
+        # Pass the orchestrator's semaphore so every workflow shares one admission limit
+        self.semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+
+        # Page texts of the last translate_pdf call, kept for validation
+        self.source_pages: List[str] | None = None
+        self.translated_pages: List[str] | None = None
 
     async def translate_pdf(
         self,
@@ -40,75 +84,85 @@ class PdfFormattingService:
         2. Translate text blocks
         3. Use text redaction and overlay to replace text in original PDF
         """
-        # Open the original PDF
-        doc = fitz.open(file_path)
-
-        try:
-            # Extract page-level text for clean justified output
-            all_text_items: List[str] = []
-            text_metadata: List[Dict[str, Any]] = []
-
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                page_text = page.get_text("text").strip()
-
-                if page_text:
-                    all_text_items.append(page_text)
-                    text_metadata.append({"page_num": page_num})
+        # Page-level text for clean justified output; the document is closed
+        # before translation so it isn't held open across the LLM calls
+        all_text_items: List[str] = []
+        text_metadata: List[Dict[str, Any]] = []
+
+        for page_num, page_text in enumerate(self._extract_pages(file_path)):
+            if page_text:
+                all_text_items.append(page_text)
+                text_metadata.append({"page_num": page_num})
+
+        total_items = len(all_text_items)
+        logger.info(f"PDF extraction: found {total_items} pages with text")
+
+        if total_items == 0:
+            logger.warning("No text found in PDF, returning copy of original")
+            return self._copy_pdf(file_path)
+
+        logger.info(f"Sample extracted text: {all_text_items[0][:120]}...")
+
+        if progress_callback:
+            await progress_callback(10)
+
+        # Report progress from a shared counter as page batches complete
+        completed_pages = 0
+
+        async def on_batch_done(count: int) -> None:
+            nonlocal completed_pages
+            completed_pages += count
+            if progress_callback:
+                await progress_callback(10 + int(completed_pages / total_items * 80))
+
+        async def translate_pages(pages: List[str]) -> List[str]:
+            return await asyncio.gather(*(
+                self._translate_block_with_progress(text, target_language, idx, len(pages))
+                for idx, text in enumerate(pages)
+            ))
+
+        # Pack pages into as few LLM requests as possible; only the pages of a
+        # failed batch are retried one by one
+        translated_texts = await translation.translate_batch(
+            all_text_items,
+            target_language,
+            on_batch_done=on_batch_done,
+            semaphore=self.semaphore,
+            fallback=translate_pages
+        )
+
+        # Replace failed or policy-blocked translations with the original text
+        cleaned_translations: List[str] = []
+        for original, translated in zip(all_text_items, translated_texts):
+            cleaned_translations.append(self._clean_translation(original, translated))
+
+        # Log translation results
+        non_empty_translations = sum(1 for t in cleaned_translations if t and t.strip())
+        logger.info(f"Translation complete: {non_empty_translations}/{len(cleaned_translations)} usable translations")
+        if cleaned_translations:
+            sample = cleaned_translations[0]
+            logger.info(f"Sample translation: {sample[:100] if sample else '(empty)'}...")
+
+        self.source_pages = all_text_items
+        self.translated_pages = cleaned_translations
+
+        if progress_callback:
+            await progress_callback(90)
+
+        output_path = await self._create_simple_translated_pdf(
+            cleaned_translations,
+            text_metadata
+        )
+
+        if progress_callback:
+            await progress_callback(100)
 
-            total_items = len(all_text_items)
-            logger.info(f"PDF extraction: found {total_items} pages with text")
-
-            if total_items == 0:
-                logger.warning("No text found in PDF, returning copy of original")
-                return self._copy_pdf(file_path)
-
-            if total_items > 0:
-                logger.info(f"Sample extracted text: {all_text_items[0][:120]}...")
-
-                if progress_callback:
-                    await progress_callback(10)
-
-                # Translate all text items in parallel
-                translation_tasks = [
-                    self._translate_block_with_progress(
-                        text,
-                        target_language,
-                        idx,
-                        total_items,
-                        progress_callback
-                    )
-                    for idx, text in enumerate(all_text_items)
-                ]
-
-                translated_texts = await asyncio.gather(*translation_tasks)
-
-                # Replace failed or policy-blocked translations with the original text
-                cleaned_translations: List[str] = []
-                for original, translated in zip(all_text_items, translated_texts):
-                    cleaned_translations.append(self._clean_translation(original, translated))
-
-                # Log translation results
-                non_empty_translations = sum(1 for t in cleaned_translations if t and t.strip())
-                logger.info(f"Translation complete: {non_empty_translations}/{len(cleaned_translations)} usable translations")
-                if cleaned_translations:
-                    sample = cleaned_translations[0]
-                    logger.info(f"Sample translation: {sample[:100] if sample else '(empty)'}...")
-
-                if progress_callback:
-                    await progress_callback(90)
-
-                output_path = await self._create_simple_translated_pdf(
-                    cleaned_translations,
-                    text_metadata
-                )
-
-                if progress_callback:
-                    await progress_callback(100)
+        return output_path
 
-                return output_path
-        finally:
-            doc.close()
+    def _extract_pages(self, file_path: str) -> List[str]:
+        """Return the stripped plain text of every page."""
+        with fitz.open(file_path) as doc:
+            return [page.get_text("text").strip() for page in doc]
 
     async def _translate_block_with_progress(
         self,
@@ -141,16 +195,13 @@ class PdfFormattingService:
         """
         from app.services.writer import PdfWriter
 
-        # Since we extract at page level, each text is already a complete page
-        pages = []
-        for text, meta in zip(translated_texts, text_metadata):
-            pages.append(text)
-
-        logger.info(f"Using simple PDF writer with {len(pages)} pages")
+        # Since we extract at page level, each text is already a complete page;
+        # hand the list to the writer as-is instead of copying it
+        logger.info(f"Using simple PDF writer with {len(translated_texts)} pages")
 
         # Use the simple, reliable PdfWriter
         writer = PdfWriter()
-        output_path = writer.write(pages, "translated.pdf")
+        output_path = writer.write(translated_texts, "translated.pdf")
 
         return output_path
 
@@ -175,17 +226,7 @@ class PdfFormattingService:
         if not stripped:
             return original_text
 
-        lower = stripped.lower()
-        guard_phrases = [
-            "i'm sorry",
-            "i am sorry",
-            "cannot assist",
-            "can't assist",
-            "not able to help",
-            "i cannot comply",
-        ]
-
-        if any(phrase in lower for phrase in guard_phrases):
+        if _GUARD_PHRASE_RE.search(stripped):
             return original_text
 
         return stripped
@@ -231,45 +272,15 @@ class PdfFormattingService:
     def _map_font(self, font_name: str, flags: int) -> str:
         """Map extracted font names to built-in fonts available in PyMuPDF."""
         font_name = (font_name or "").lower()
-        is_serif = any(keyword in font_name for keyword in ["times", "serif", "roman"])
-        is_mono = any(keyword in font_name for keyword in ["mono", "cour", "typewriter"])
 
-        if is_mono:
+        if _MONO_FONT_RE.search(font_name):
             base = "courier"
-        elif is_serif:
+        elif _SERIF_FONT_RE.search(font_name):
             base = "times"
         else:
             base = "helvetica"
 
-        bold = bool(flags & 2**4)
-        italic = bool(flags & 2**1)
-
-        if base == "courier":
-            if bold and italic:
-                return "courier-boldoblique"
-            if bold:
-                return "courier-bold"
-            if italic:
-                return "courier-oblique"
-            return "courier"
-
-        if base == "times":
-            if bold and italic:
-                return "times-bolditalic"
-            if bold:
-                return "times-bold"
-            if italic:
-                return "times-italic"
-            return "times-roman"
-
-        # Helvetica family
-        if bold and italic:
-            return "helvetica-boldoblique"
-        if bold:
-            return "helvetica-bold"
-        if italic:
-            return "helvetica-oblique"
-        return "helvetica"
+        return _BUILTIN_FONTS[(base, bool(flags & _FLAG_BOLD), bool(flags & _FLAG_ITALIC))]
 
     def _copy_pdf(self, file_path: str) -> str:
         """Return a temporary copy of the original PDF."""
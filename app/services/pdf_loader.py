@@ -3,8 +3,5 @@
 import fitz  # PyMuPDF
 
 def load_pdf(file_bytes: bytes) -> list[str]:
-    doc = fitz.open(stream=file_bytes, filetype="pdf")
-    pages = []
-    for page in doc:
-        pages.append(page.get_text())
-    return pages
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        return [page.get_text() for page in doc]
@@ -4,6 +4,9 @@ PPTX Translation Service - Handles structured translation with formatting preser
 import asyncio
 from typing import Dict, Any, List, Callable, Awaitable
 from app.services import translation
+from app.core.logging import get_logger
+
+logger = get_logger("PptxTranslationService")
 
 
 class PptxTranslationService:
@@ -11,8 +14,10 @@ class PptxTranslationService:
     Translates PPTX content while preserving structure and formatting.
     """
 
-    def __init__(self, max_concurrency: int = 5):
-        self.semaphore = asyncio.Semaphore(max_concurrency)
+    def __init__(self, max_concurrency: int = 5, semaphore: asyncio.Semaphore | None = None):
+        # Pass the orchestrator's semaphore so every workflow shares one admission limit
+        self.semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
 
     async def translate_slides(
         self,
@@ -29,252 +34,111 @@ class PptxTranslationService:
             progress_callback: Optional callback for progress updates
 
         Returns:
-            List of slide dicts with translated text
+            The slide dicts, with translated text written in place
         """
-        # Collect all translatable text items
-        text_items = []
-        item_metadata = []  # Track where each text item belongs
+        # Collect all translatable text items together with the run/cell dicts
+        # they came from, so translations can be written straight back
+        text_items: List[str] = []
+        targets: List[Dict[str, Any]] = []
+        paragraphs: List[Dict[str, Any]] = []
 
         for slide_data in slides_data:
-            for shape in slide_data['shapes']:
-                items = self._collect_text_items(
-                    shape,
-                    slide_data['slide_index']
-                )
-                text_items.extend([item[0] for item in items])
-                item_metadata.extend([item[1] for item in items])
+            self._collect_text_items(slide_data['shapes'], text_items, targets, paragraphs)
 
         total_items = len(text_items)
         if total_items == 0:
             return slides_data
 
-        # Translate all text items in parallel
-        translation_tasks = [
-            self._translate_text_with_progress(
-                text,
-                target_language,
-                idx,
-                total_items,
-                progress_callback
-            )
-            for idx, text in enumerate(text_items)
-        ]
-
-        translated_texts = await asyncio.gather(*translation_tasks)
-
-        # Build a mapping of translations
-        translations_map = {}
-        for metadata, translated in zip(item_metadata, translated_texts):
-            key = self._make_key(metadata)
-            translations_map[key] = translated
-
-        # Apply translations back to the structure
-        translated_slides = []
-        for slide_data in slides_data:
-            translated_slide = {
-                'slide_index': slide_data['slide_index'],
-                'shapes': []
-            }
-
-            for shape in slide_data['shapes']:
-                translated_shape = self._apply_translations(
-                    shape,
-                    slide_data['slide_index'],
-                    translations_map
-                )
-                translated_slide['shapes'].append(translated_shape)
+        # Runs and cells are mostly short labels: pack them into as few LLM
+        # requests as possible, reporting progress as batches complete
+        completed_items = 0
 
-            translated_slides.append(translated_slide)
+        async def on_batch_done(count: int) -> None:
+            nonlocal completed_items
+            completed_items += count
+            if progress_callback:
+                await progress_callback(int(completed_items / total_items * 90))  # 0-90%
+
+        # Only the items of a failed batch are retried one by one; their
+        # progress is reported by on_batch_done once the batch is settled
+        translated_texts = await translation.translate_batch(
+            text_items,
+            target_language,
+            on_batch_done=on_batch_done,
+            semaphore=self.semaphore,
+            fallback=lambda texts: self._translate_texts(texts, target_language)
+        )
+
+        # Write translations into the runs/cells they came from
+        for target, translated in zip(targets, translated_texts):
+            target['text'] = translated
+
+        # Refresh the derived paragraph texts
+        for para in paragraphs:
+            para['text'] = ''.join(run['text'] for run in para.get('runs', []))
 
         if progress_callback:
             await progress_callback(100)
 
-        return translated_slides
+        return slides_data
 
     def _collect_text_items(
         self,
-        shape_data: Dict[str, Any],
-        slide_idx: int,
-        shape_path: List[int] = None
-    ) -> List[tuple[str, Dict[str, Any]]]:
+        shapes: List[Dict[str, Any]],
+        text_items: List[str],
+        targets: List[Dict[str, Any]],
+        paragraphs: List[Dict[str, Any]]
+    ) -> None:
         """
-        Recursively collect all translatable text items.
+        Collect all translatable text items from a slide's shapes.
 
-        Returns:
-            List of (text, metadata) tuples
+        Appends the stripped text of every non-blank run and table cell to
+        ``text_items`` and the run/cell dict itself to ``targets``; paragraphs
+        holding a translatable run go to ``paragraphs``. The loader's output
+        isn't reused after translation, so it is updated in place rather than
+        copied. Groups are expanded with an explicit stack.
         """
-        if shape_path is None:
-            shape_path = []
-
-        items = []
-        shape_type = shape_data.get('type')
-        current_path = shape_path + [shape_data['shape_index']]
-
-        if shape_type == 'text':
-            # Collect text from each run in each paragraph
-            for para_idx, para in enumerate(shape_data.get('paragraphs', [])):
-                for run_idx, run in enumerate(para.get('runs', [])):
-                    text = run.get('text', '').strip()
-                    if text:
-                        metadata = {
-                            'slide_idx': slide_idx,
-                            'shape_path': current_path.copy(),
-                            'para_idx': para_idx,
-                            'run_idx': run_idx,
-                            'type': 'run'
-                        }
-                        items.append((text, metadata))
-
-        elif shape_type == 'table':
-            # Collect text from each table cell
-            table_data = shape_data.get('table_data', {})
-            for row_idx, row in enumerate(table_data.get('rows', [])):
-                for col_idx, cell in enumerate(row):
-                    text = cell.get('text', '').strip()
-                    if text:
-                        metadata = {
-                            'slide_idx': slide_idx,
-                            'shape_path': current_path.copy(),
-                            'row_idx': row_idx,
-                            'col_idx': col_idx,
-                            'type': 'table_cell'
-                        }
-                        items.append((text, metadata))
-
-        elif shape_type == 'group':
-            # Recursively collect from grouped shapes
-            for sub_shape in shape_data.get('shapes', []):
-                sub_items = self._collect_text_items(
-                    sub_shape,
-                    slide_idx,
-                    current_path
-                )
-                items.extend(sub_items)
-
-        return items
-
-    def _apply_translations(
-        self,
-        shape_data: Dict[str, Any],
-        slide_idx: int,
-        translations_map: Dict[str, str],
-        shape_path: List[int] = None
-    ) -> Dict[str, Any]:
-        """Apply translations back to the structure."""
-        if shape_path is None:
-            shape_path = []
-
-        # Create a copy of the shape data
-        translated_shape = shape_data.copy()
-        shape_type = shape_data.get('type')
-        current_path = shape_path + [shape_data['shape_index']]
-
-        if shape_type == 'text':
-            # Apply translations to runs
-            translated_paragraphs = []
-            for para_idx, para in enumerate(shape_data.get('paragraphs', [])):
-                translated_para = para.copy()
-                translated_runs = []
-
-                for run_idx, run in enumerate(para.get('runs', [])):
-                    translated_run = run.copy()
-                    metadata = {
-                        'slide_idx': slide_idx,
-                        'shape_path': current_path.copy(),
-                        'para_idx': para_idx,
-                        'run_idx': run_idx,
-                        'type': 'run'
-                    }
-                    key = self._make_key(metadata)
-
-                    if key in translations_map:
-                        translated_run['text'] = translations_map[key]
-
-                    translated_runs.append(translated_run)
-
-                translated_para['runs'] = translated_runs
-                # Update paragraph text as well
-                translated_para['text'] = ''.join(r['text'] for r in translated_runs)
-                translated_paragraphs.append(translated_para)
-
-            translated_shape['paragraphs'] = translated_paragraphs
-
-        elif shape_type == 'table':
-            # Apply translations to table cells
-            table_data = shape_data.get('table_data', {})
-            translated_rows = []
-
-            for row_idx, row in enumerate(table_data.get('rows', [])):
-                translated_row = []
-                for col_idx, cell in enumerate(row):
-                    translated_cell = cell.copy()
-                    metadata = {
-                        'slide_idx': slide_idx,
-                        'shape_path': current_path.copy(),
-                        'row_idx': row_idx,
-                        'col_idx': col_idx,
-                        'type': 'table_cell'
-                    }
-                    key = self._make_key(metadata)
-
-                    if key in translations_map:
-                        translated_cell['text'] = translations_map[key]
-
-                    translated_row.append(translated_cell)
-
-                translated_rows.append(translated_row)
-
-            translated_table_data = table_data.copy()
-            translated_table_data['rows'] = translated_rows
-            translated_shape['table_data'] = translated_table_data
-
-        elif shape_type == 'group':
-            # Recursively translate grouped shapes
-            translated_sub_shapes = []
-            for sub_shape in shape_data.get('shapes', []):
-                translated_sub = self._apply_translations(
-                    sub_shape,
-                    slide_idx,
-                    translations_map,
-                    current_path
-                )
-                translated_sub_shapes.append(translated_sub)
-
-            translated_shape['shapes'] = translated_sub_shapes
-
-        return translated_shape
-
-    def _make_key(self, metadata: Dict[str, Any]) -> str:
-        """Create a unique key for a text item."""
-        if metadata['type'] == 'run':
-            return (
-                f"slide_{metadata['slide_idx']}_"
-                f"shape_{'_'.join(map(str, metadata['shape_path']))}_"
-                f"para_{metadata['para_idx']}_"
-                f"run_{metadata['run_idx']}"
-            )
-        elif metadata['type'] == 'table_cell':
-            return (
-                f"slide_{metadata['slide_idx']}_"
-                f"shape_{'_'.join(map(str, metadata['shape_path']))}_"
-                f"cell_{metadata['row_idx']}_{metadata['col_idx']}"
-            )
-        return ""
-
-    async def _translate_text_with_progress(
+        # Reversed so the first shape is popped first
+        stack = list(reversed(shapes))
+        while stack:
+            shape_data = stack.pop()
+            shape_type = shape_data.get('type')
+
+            if shape_type == 'text':
+                for para in shape_data.get('paragraphs', []):
+                    has_text = False
+                    for run in para.get('runs', []):
+                        text = run.get('text', '').strip()
+                        if text:
+                            text_items.append(text)
+                            targets.append(run)
+                            has_text = True
+
+                    if has_text:
+                        paragraphs.append(para)
+
+            elif shape_type == 'table':
+                for row in shape_data.get('table_data', {}).get('rows', []):
+                    for cell in row:
+                        text = cell.get('text', '').strip()
+                        if text:
+                            text_items.append(text)
+                            targets.append(cell)
+
+            elif shape_type == 'group':
+                stack.extend(reversed(shape_data.get('shapes', [])))
+
+    async def _translate_texts(
         self,
-        text: str,
-        target_language: str,
-        index: int,
-        total: int,
-        progress_callback: Callable[[int], Awaitable[None]] | None
-    ) -> str:
-        """Translate a single text item with progress tracking."""
-        async with self.semaphore:
-            translated = await translation.translate_text(text, target_language)
-
-            if progress_callback:
-                progress = int((index + 1) / total * 90)  # 0-90%
-                await progress_callback(progress)
+        texts: List[str],
+        target_language: str
+    ) -> List[str]:
+        """
+        Translate text items individually with translation.map_with_workers, so
+        only ``max_concurrency`` coroutines exist at a time (instead of one per run/cell).
+        """
+        async def translate_item(text: str) -> str:
+            async with self.semaphore:
+                return await translation.translate_text(text, target_language)
 
-            return translated
+        return await translation.map_with_workers(texts, translate_item, self.max_concurrency)
@@ -2,28 +2,516 @@
 
 
 import asyncio
+import contextlib
+import functools
+import json
+import os
+import random
+import re
 import time
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Sequence, TypeVar
+import openai
 from agents import Runner
 from app.agents.translator import translator_agent
 from app.core.logging import get_logger
+from app.services.openai_client import SDK_MAX_RETRIES, get_openai_client, get_run_config
+from app.services.translation_cache import get_translation_cache
+from app.utils.hashing import chunk_key
 
 logger = get_logger("TranslatorService")
 
-_TRANSLATION_SEMAPHORE = asyncio.Semaphore(5)
+T = TypeVar("T")
+R = TypeVar("R")
 
+# Process-wide cap on in-flight translator requests. Services fan out with
+# asyncio.gather and rely on this to stay under the provider rate limit.
+_TRANSLATION_SEMAPHORE = asyncio.Semaphore(int(os.getenv("TRANSLATION_MAX_CONCURRENCY", "20")))
 
-async def translate_text(text: str, target_lang: str) -> str:
+# Set to False (e.g. per request by the orchestrator) to bypass the translation cache
+cache_enabled: ContextVar[bool] = ContextVar("translation_cache_enabled", default=True)
+
+
+class _InFlight:
+    """A shared translation task and the number of callers awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+# Translations currently running, keyed by chunk_key(text, target language, context).
+# Each runs in its own task, so a caller being cancelled (e.g. a websocket
+# disconnect) doesn't cancel it for other requests awaiting the same text; it
+# is cancelled only when no caller is left waiting for it.
+_in_flight: dict[bytes, _InFlight] = {}
+
+_BATCH_API_POLL_MAX_DELAY = 300  # seconds
+
+# Segments of a batched request are joined with a line containing only "%%"
+BATCH_SEPARATOR = "\n%%\n"
+_BATCH_SPLIT_RE = re.compile(r"\n[ \t]*%%[ \t]*\n")
+_BATCH_INSTRUCTION = (
+    "The text below contains {count} independent segments separated by lines "
+    "containing only %%. Translate each segment and keep every %% separator line "
+    "exactly where it is, so the output contains the same {count} segments in the same order."
+)
+
+
+# Retry transient provider errors with full-jitter exponential backoff. The shared
+# client has SDK retries disabled, so each attempt here is exactly one request
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+_MAX_ATTEMPTS = int(os.getenv("TRANSLATION_MAX_ATTEMPTS", "6"))
+_MAX_BACKOFF = 30.0  # seconds
+
+# Circuit breaker: after this many consecutive failures every caller pauses,
+# so a burst of 429s backs the whole process off instead of each chunk hammering the API
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN = 30.0  # seconds
+_consecutive_failures = 0
+_breaker_open_until = 0.0
+
+
+class _TokenBucket:
+    """
+    Async token bucket refilled continuously at ``per_minute`` units per minute.
+
+    Waiters are served in arrival order; a request larger than the bucket
+    waits for a full bucket rather than forever.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0  # units per second
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: int = 1) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+# Optional client-side pacing to the account's rate limits (0 = unlimited), so
+# bursts of large chunks wait locally instead of collecting 429s and backoff
+_OPENAI_RPM = int(os.getenv("OPENAI_RPM", "0"))
+_OPENAI_TPM = int(os.getenv("OPENAI_TPM", "0"))
+_rpm_bucket = _TokenBucket(_OPENAI_RPM) if _OPENAI_RPM > 0 else None
+_tpm_bucket = _TokenBucket(_OPENAI_TPM) if _OPENAI_TPM > 0 else None
+
+
+async def _run_translator(prompt: str) -> str:
+    global _consecutive_failures, _breaker_open_until
+
+    # Rough token cost: ~4 chars per token for the prompt, plus a similar-sized output
+    estimated_tokens = len(prompt) // 2
+
+    for attempt in range(_MAX_ATTEMPTS):
+        wait = _breaker_open_until - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        if _rpm_bucket is not None:
+            await _rpm_bucket.acquire()
+        if _tpm_bucket is not None:
+            await _tpm_bucket.acquire(estimated_tokens)
+
+        try:
+            async with _TRANSLATION_SEMAPHORE:
+                result = await Runner.run(translator_agent, input=prompt, run_config=get_run_config())
+        except _RETRYABLE_ERRORS as e:
+            _consecutive_failures += 1
+            if _consecutive_failures >= _BREAKER_THRESHOLD:
+                _breaker_open_until = time.monotonic() + _BREAKER_COOLDOWN
+                logger.warning(
+                    f"{_consecutive_failures} consecutive translator failures, "
+                    f"pausing requests for {_BREAKER_COOLDOWN:.0f}s"
+                )
+
+            if attempt == _MAX_ATTEMPTS - 1:
+                raise
+
+            delay = random.uniform(0, min(_MAX_BACKOFF, 2 ** attempt))
+            logger.warning(
+                f"Translator call failed ({type(e).__name__}), "
+                f"retry {attempt + 1}/{_MAX_ATTEMPTS - 1} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            continue
+
+        _consecutive_failures = 0
+        return result.final_output
+
+
+async def translate_text(
+    text: str,
+    target_lang: str,
+    context: str | None = None,
+    refresh: bool = False
+) -> str:
+    """
+    Translate one piece of text.
+
+    ``context`` (e.g. the tail of the previous chunk's translation) is sent
+    alongside the text for coherence but is not part of the cache key, and the
+    model is told not to translate it. Concurrent calls share one request only
+    when their context matches too.
+
+    ``refresh`` skips cached and in-flight translations (e.g. when retrying a
+    translation that failed validation) and replaces the cached entry with the
+    new result.
+    """
+    use_cache = cache_enabled.get()
+    if refresh:
+        return await _translate_uncached(text, target_lang, use_cache, context)
+
+    if use_cache:
+        cached = await get_translation_cache().lookup(text, target_lang)
+        if cached is not None:
+            return cached
+
+    # Duplicate chunks (headers, footers, boilerplate) are usually dispatched together,
+    # before the first one reaches the cache: await the in-flight translation instead
+    key = chunk_key(text, target_lang, context)
+    entry = _in_flight.get(key)
+    if entry is None:
+        entry = _InFlight(asyncio.create_task(
+            _translate_uncached(text, target_lang, use_cache, context)
+        ))
+        _in_flight[key] = entry
+        entry.task.add_done_callback(functools.partial(_end_in_flight, key, entry))
+
+    entry.waiters += 1
+    try:
+        return await asyncio.shield(entry.task)
+    finally:
+        entry.waiters -= 1
+        if entry.waiters == 0 and not entry.task.done():
+            # Every caller was cancelled: stop the request, and don't let new
+            # callers join a task that is being cancelled
+            entry.task.cancel()
+            _end_in_flight(key, entry, entry.task)
+
+
+def _end_in_flight(key: bytes, entry: _InFlight, task: asyncio.Task) -> None:
+    if _in_flight.get(key) is entry:
+        del _in_flight[key]
+    if task.done() and not task.cancelled():
+        task.exception()  # Mark retrieved; waiters (if any) re-raise it
+
+
+def forget_translation(text: str, target_lang: str) -> None:
+    """Drop the cached translation of ``text`` (e.g. one that failed validation)."""
+    if cache_enabled.get():
+        get_translation_cache().delete(text, target_lang)
+
+
+async def _translate_uncached(
+    text: str,
+    target_lang: str,
+    use_cache: bool,
+    context: str | None = None
+) -> str:
     start = time.time()
 
-    async with _TRANSLATION_SEMAPHORE:
-        result = await Runner.run(
-            translator_agent,
-            input=f"Target language: {target_lang}\n\nText:\n{text}"
-        )
+    context_section = (
+        f"Previous context for coherence (do not translate or repeat it): ...{context}\n\n"
+        if context else ""
+    )
+    translated = await _run_translator(
+        f"Target language: {target_lang}\n\n{context_section}Text:\n{text}"
+    )
 
     logger.info(
         f"Translation completed in {time.time() - start:.2f}s "
         f"(chars={len(text)})"
     )
 
-    return result.final_output
+    if use_cache:
+        get_translation_cache().set(text, target_lang, translated)
+
+    return translated
+
+
+async def translate_batch(
+    chunks: list[str],
+    target_language: str,
+    max_chars: int = 6000,
+    max_items: int = 20,
+    on_batch_done: Callable[[int], Awaitable[None]] | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    fallback: Callable[[list[str]], Awaitable[list[str]]] | None = None,
+) -> list[str]:
+    """
+    Translate many chunks with as few LLM requests as possible.
+
+    Chunks are greedily packed into batches of at most ``max_items`` items and
+    ``max_chars`` characters, joined with BATCH_SEPARATOR and sent as one request
+    per batch. If the model does not return the same number of segments, that
+    batch falls back to per-chunk translation. Cached chunks are not sent, and
+    repeated chunks are sent once.
+    ``on_batch_done`` is awaited with the number of chunks finished by each batch.
+    ``semaphore`` (e.g. the caller's request admission limit) is held around
+    each batch request; don't pass one the caller already holds.
+    ``fallback`` is awaited with the chunks of a batch whose request raised and
+    must return their translations; other batches are unaffected. Without it,
+    the error is raised.
+
+    Returns:
+        Translations aligned with ``chunks``
+    """
+    translated: list[str | None] = [None] * len(chunks)
+    pending = list(range(len(chunks)))
+
+    if cache_enabled.get():
+        translated = await get_translation_cache().lookup_many(chunks, target_language)
+        pending = [idx for idx, text in enumerate(translated) if text is None]
+
+        if on_batch_done and len(pending) < len(chunks):
+            await on_batch_done(len(chunks) - len(pending))
+
+    # Repeated chunks are translated once and fanned back out
+    occurrences: dict[str, int] = {}
+    for idx in pending:
+        occurrences[chunks[idx]] = occurrences.get(chunks[idx], 0) + 1
+
+    batches: list[list[str]] = []
+    current: list[str] = []
+    current_chars = 0
+
+    for chunk in occurrences:
+        if current and (current_chars + len(chunk) > max_chars or len(current) >= max_items):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(chunk)
+        current_chars += len(chunk)
+
+    if current:
+        batches.append(current)
+
+    async def run_batch(batch: list[str]) -> list[str]:
+        try:
+            async with semaphore or contextlib.nullcontext():
+                batch_result = await _translate_packed(batch, target_language)
+        except Exception as e:
+            if fallback is None:
+                raise
+            logger.error(f"Batch of {len(batch)} chunks failed, translating them individually: {e}")
+            batch_result = await fallback(batch)
+        if on_batch_done:
+            await on_batch_done(sum(occurrences[chunk] for chunk in batch))
+        return batch_result
+
+    results = await asyncio.gather(*(run_batch(batch) for batch in batches))
+    translations = {
+        chunk: text
+        for batch, batch_result in zip(batches, results)
+        for chunk, text in zip(batch, batch_result)
+    }
+    for idx in pending:
+        translated[idx] = translations[chunks[idx]]
+
+    return translated
+
+
+async def _translate_packed(batch: list[str], target_language: str) -> list[str]:
+    """Translate one packed batch, falling back to per-chunk calls on misalignment."""
+    if len(batch) == 1:
+        return [await translate_text(batch[0], target_language)]
+
+    start = time.time()
+    instruction = _BATCH_INSTRUCTION.format(count=len(batch))
+    translated = await _run_translator(
+        f"Target language: {target_language}\n\n{instruction}\n\n"
+        f"Text:\n{BATCH_SEPARATOR.join(batch)}"
+    )
+    segments = _BATCH_SPLIT_RE.split(translated)
+
+    if len(segments) != len(batch):
+        logger.warning(
+            f"Batch translation returned {len(segments)} segments for {len(batch)} chunks, "
+            f"falling back to per-chunk translation"
+        )
+        return list(await asyncio.gather(
+            *(translate_text(chunk, target_language) for chunk in batch)
+        ))
+
+    logger.info(
+        f"Batch translation completed in {time.time() - start:.2f}s "
+        f"(chunks={len(batch)}, chars={sum(len(c) for c in batch)})"
+    )
+
+    if cache_enabled.get():
+        get_translation_cache().set_many(list(zip(batch, segments)), target_language)
+
+    return segments
+
+
+async def map_with_workers(
+    items: Sequence[T],
+    func: Callable[[T], Awaitable[R]],
+    max_workers: int,
+    progress_callback: Callable[[int], Awaitable[None]] | None = None,
+    progress: Callable[[int, int], int] | None = None,
+) -> list[R]:
+    """
+    Await ``func`` on every item with a fixed pool of workers pulling from a queue.
+
+    Only ``max_workers`` coroutines exist at a time (instead of one per item).
+    After each item, ``progress_callback`` is awaited with ``progress(done, total)``,
+    so progress is reported in completion order and only moves forward. If an
+    item fails, the other workers are cancelled and the error is raised.
+
+    Returns:
+        Results aligned with ``items``
+    """
+    total = len(items)
+    results: list = [None] * total
+    queue: asyncio.Queue[tuple[int, T]] = asyncio.Queue()
+    for item in enumerate(items):
+        queue.put_nowait(item)
+
+    done = 0
+
+    async def worker() -> None:
+        nonlocal done
+        while not queue.empty():
+            idx, item = queue.get_nowait()
+            results[idx] = await func(item)
+
+            # No await between the increment and the read, so no lock is needed
+            done += 1
+            if progress_callback and progress:
+                await progress_callback(progress(done, total))
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(max_workers, total))]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        raise
+
+    return results
+
+
+async def translate_via_batch_api(chunks: list[str], target_language: str) -> list[str]:
+    """
+    Translate chunks through the OpenAI Batch API (jsonl upload -> poll -> download).
+
+    Trades latency (completion window up to 24h) for ~50% lower cost and higher
+    sustained throughput than real-time requests. Cached chunks are not sent,
+    repeated chunks are sent once, and the job's results are cached. Chunks the
+    batch job did not return are translated in real time.
+
+    Returns:
+        Translations aligned with ``chunks``
+    """
+    translated: list[str | None] = [None] * len(chunks)
+
+    if cache_enabled.get():
+        translated = await get_translation_cache().lookup_many(chunks, target_language)
+
+    # Distinct uncached chunks, in document order
+    pending = list(dict.fromkeys(
+        chunk for chunk, text in zip(chunks, translated) if text is None
+    ))
+    if not pending:
+        return translated
+
+    translations = dict(zip(pending, await _run_batch_job(pending, target_language)))
+    return [
+        text if text is not None else translations[chunk]
+        for chunk, text in zip(chunks, translated)
+    ]
+
+
+async def _run_batch_job(chunks: list[str], target_language: str) -> list[str]:
+    """Submit one Batch API job for ``chunks`` and wait for its results."""
+    # Not covered by _run_translator's retries, so file/batch calls keep the SDK's own
+    client = get_openai_client().with_options(max_retries=SDK_MAX_RETRIES)
+    start = time.time()
+
+    lines = []
+    for idx, chunk in enumerate(chunks):
+        lines.append(json.dumps({
+            "custom_id": str(idx),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": translator_agent.model,
+                "messages": [
+                    {"role": "system", "content": translator_agent.instructions},
+                    {"role": "user", "content": f"Target language: {target_language}\n\nText:\n{chunk}"},
+                ],
+            },
+        }))
+
+    input_file = await client.files.create(
+        file=("translation_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logger.info(f"Submitted batch {batch.id} with {len(chunks)} chunks")
+
+    # Poll with exponential backoff until the batch reaches a terminal state
+    delay = 5
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, _BATCH_API_POLL_MAX_DELAY)
+        batch = await client.batches.retrieve(batch.id)
+
+    translated: list[str | None] = [None] * len(chunks)
+
+    if batch.output_file_id:
+        output = await client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            idx = int(record["custom_id"])
+            translated[idx] = response["body"]["choices"][0]["message"]["content"]
+
+        if cache_enabled.get():
+            get_translation_cache().set_many(
+                [(chunk, text) for chunk, text in zip(chunks, translated) if text is not None],
+                target_language,
+            )
+
+    missing = [idx for idx, text in enumerate(translated) if text is None]
+    logger.info(
+        f"Batch {batch.id} finished with status '{batch.status}' in {time.time() - start:.0f}s "
+        f"({len(chunks) - len(missing)}/{len(chunks)} chunks returned)"
+    )
+
+    if missing:
+        logger.warning(f"Translating {len(missing)} chunks missing from batch {batch.id} in real time")
+        retried = await asyncio.gather(
+            *(translate_text(chunks[idx], target_language) for idx in missing)
+        )
+        for idx, text in zip(missing, retried):
+            translated[idx] = text
+
+    return translated
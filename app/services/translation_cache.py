@@ -0,0 +1,273 @@
+"""
+Translation Cache - Reuse translations of recurring text
+
+Documents repeat a lot of text (headers, footers, legal boilerplate, slide
+masters) and users re-upload the same files. Translations are cached in two
+tiers keyed by (text, target language), with the text hash keyed by the
+translator model so switching OPENAI_MODEL never serves another model's output:
+1. In-process LRU for hot entries
+2. SQLite (WAL mode) shared across processes and restarts
+"""
+import asyncio
+import atexit
+import hashlib
+import itertools
+import operator
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from app.core.logging import get_logger
+
+logger = get_logger("TranslationCache")
+
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.cache/stark/translations.db")
+CACHE_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+_PURGE_INTERVAL_SECONDS = 24 * 3600
+
+_INSERT_SQL = "INSERT OR REPLACE INTO cache (hash, lang, translation, ts) VALUES (?, ?, ?, ?)"
+_DELETE_SQL = "DELETE FROM cache WHERE hash = ? AND lang = ?"
+
+
+class TranslationCache:
+    """
+    Two-tier (memory LRU + SQLite) translation cache.
+
+    Lookups hit the memory tier inline; disk reads run in a worker thread
+    (``lookup``/``lookup_many``), and writes are queued to a writer thread that
+    commits whatever has accumulated as one transaction, so the event loop
+    never blocks on SQLite. Falls back to memory-only caching when the
+    database cannot be opened.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_CACHE_PATH,
+        max_memory_items: int = 4096,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+        namespace: str = "",
+    ):
+        self.max_memory_items = max_memory_items
+        # BLAKE2 key (max 64 bytes); entries written under another namespace never match
+        self._hash_key = namespace.encode()[:64]
+        self.ttl_seconds = ttl_seconds
+        # Deleted keys map to None until the delete is committed, so a disk read
+        # can't bring the old translation back in the meantime
+        self._memory: OrderedDict[tuple[bytes, str], Optional[str]] = OrderedDict()
+        self._lock = threading.Lock()  # Guards the memory tier
+        self._db_lock = threading.Lock()  # Serializes use of the SQLite connection
+        self._writes: queue.Queue[tuple[str, tuple]] = queue.Queue()
+        self._next_purge = 0.0
+        self._db: Optional[sqlite3.Connection] = None
+
+        try:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "hash BLOB NOT NULL, lang TEXT NOT NULL, translation TEXT NOT NULL, "
+                "ts INTEGER NOT NULL, PRIMARY KEY (hash, lang))"
+            )
+            self._db.commit()
+            self.purge_expired()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Translation cache database unavailable ({db_path}): {e}")
+            self._db = None
+
+        if self._db is not None:
+            threading.Thread(target=self._write_loop, name="translation-cache-writer", daemon=True).start()
+
+    def _hash(self, text: str) -> bytes:
+        return hashlib.blake2b(text.encode(), digest_size=16, key=self._hash_key).digest()
+
+    def get(self, text: str, target_lang: str) -> Optional[str]:
+        """Return the cached translation, or None on a miss (blocking; use lookup on the event loop)."""
+        key = (self._hash(text), target_lang)
+        found, cached = self._get_memory(key)
+        if found:
+            return cached
+        return self._load([key])[0]
+
+    async def lookup(self, text: str, target_lang: str) -> Optional[str]:
+        """Return the cached translation, or None on a miss; disk reads run in a worker thread."""
+        return (await self.lookup_many([text], target_lang))[0]
+
+    async def lookup_many(self, texts: list[str], target_lang: str) -> list[Optional[str]]:
+        """Cached translations aligned with ``texts`` (None for misses), with one disk round trip."""
+        results: list[Optional[str]] = [None] * len(texts)
+        missing: list[int] = []
+        keys = [(self._hash(text), target_lang) for text in texts]
+
+        for idx, key in enumerate(keys):
+            found, results[idx] = self._get_memory(key)
+            if not found:
+                missing.append(idx)
+
+        if missing and self._db is not None:
+            loaded = await asyncio.to_thread(self._load, [keys[idx] for idx in missing])
+            for idx, translation in zip(missing, loaded):
+                results[idx] = translation
+
+        return results
+
+    def set(self, text: str, target_lang: str, translation: str) -> None:
+        """Store a translation in both tiers; the disk write is queued, not awaited."""
+        self.set_many([(text, translation)], target_lang)
+
+    def set_many(self, items: list[tuple[str, str]], target_lang: str) -> None:
+        """Store (text, translation) pairs in both tiers."""
+        now = int(time.time())
+        rows = []
+
+        with self._lock:
+            for text, translation in items:
+                key = (self._hash(text), target_lang)
+                self._remember(key, translation)
+                rows.append((key[0], target_lang, translation, now))
+
+        if self._db is not None:
+            for row in rows:
+                self._writes.put((_INSERT_SQL, row))
+
+    def delete(self, text: str, target_lang: str) -> None:
+        """Remove one translation from both tiers."""
+        key = (self._hash(text), target_lang)
+
+        with self._lock:
+            if self._db is None:
+                self._memory.pop(key, None)
+                return
+            self._remember(key, None)
+
+        self._writes.put((_DELETE_SQL, key))
+
+    def purge_expired(self) -> None:
+        """Delete persisted entries older than the TTL."""
+        self._next_purge = time.time() + _PURGE_INTERVAL_SECONDS
+
+        if self._db is None:
+            return
+
+        with self._db_lock:
+            try:
+                deleted = self._db.execute(
+                    "DELETE FROM cache WHERE ts < ?",
+                    (int(time.time()) - self.ttl_seconds,),
+                ).rowcount
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to purge translation cache: {e}")
+                return
+
+        if deleted:
+            logger.info(f"Purged {deleted} expired translation cache entries")
+
+    def clear(self) -> None:
+        """Drop every cached translation from both tiers."""
+        with self._lock:
+            self._memory.clear()
+
+        if self._db is not None:
+            self._writes.put(("DELETE FROM cache", ()))
+            self.flush()
+
+    def flush(self) -> None:
+        """Block until every queued write has been committed."""
+        self._writes.join()
+
+    def _get_memory(self, key: tuple[bytes, str]) -> tuple[bool, Optional[str]]:
+        with self._lock:
+            if key not in self._memory:
+                return False, None
+            self._memory.move_to_end(key)
+            return True, self._memory[key]
+
+    def _load(self, keys: list[tuple[bytes, str]]) -> list[Optional[str]]:
+        """Read translations from SQLite (blocking) and promote hits to memory."""
+        results: list[Optional[str]] = [None] * len(keys)
+        if self._db is None:
+            return results
+
+        oldest = int(time.time()) - self.ttl_seconds
+        with self._db_lock:
+            for idx, (digest, lang) in enumerate(keys):
+                row = self._db.execute(
+                    "SELECT translation FROM cache WHERE hash = ? AND lang = ? AND ts >= ?",
+                    (digest, lang, oldest),
+                ).fetchone()
+                if row is not None:
+                    results[idx] = row[0]
+
+        with self._lock:
+            for key, translation in zip(keys, results):
+                # Skip keys written or deleted in memory while we were reading
+                if translation is not None and key not in self._memory:
+                    self._remember(key, translation)
+
+        return results
+
+    def _write_loop(self) -> None:
+        """Writer thread: commit queued writes in batches (one transaction per batch)."""
+        while True:
+            batch = [self._writes.get()]
+            # Everything queued meanwhile goes into the same transaction
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                with self._db_lock:
+                    # Consecutive statements of the same kind run as one executemany
+                    for sql, group in itertools.groupby(batch, key=operator.itemgetter(0)):
+                        self._db.executemany(sql, [params for _, params in group])
+                    self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist {len(batch)} translation cache writes: {e}")
+            finally:
+                # Committed deletes no longer need their memory tombstone
+                with self._lock:
+                    for sql, key in batch:
+                        if sql == _DELETE_SQL and key in self._memory and self._memory[key] is None:
+                            del self._memory[key]
+
+                for _ in batch:
+                    self._writes.task_done()
+
+            if time.time() >= self._next_purge:
+                self.purge_expired()
+
+    def _remember(self, key: tuple[bytes, str], translation: Optional[str]) -> None:
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+
+# Singleton instance
+_translation_cache = None
+
+def get_translation_cache() -> TranslationCache:
+    """Get or create translation cache singleton."""
+    global _translation_cache
+    if _translation_cache is None:
+        from app.agents.translator import translator_agent
+
+        _translation_cache = TranslationCache(
+            os.path.expanduser(os.getenv("TRANSLATION_CACHE_PATH", DEFAULT_CACHE_PATH)),
+            namespace=str(translator_agent.model),
+        )
+        # Commit queued writes before the process exits
+        atexit.register(_translation_cache.flush)
+    return _translation_cache
+
+
+def clear_translation_cache() -> None:
+    """Empty the translation cache (e.g. after changing the translator prompt or model)."""
+    get_translation_cache().clear()
@@ -1,13 +1,71 @@
 
-import json
+import asyncio
+import os
 import random
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from agents import Runner
-from app.agents.validator import validator_agent
+from app.agents.validator import validator_agent, batch_validator_agent
 from app.core.logging import get_logger
+from app.services.openai_client import get_retrying_run_config
+from app.utils.language import same_language
 
 logger = get_logger("ValidatorService")
 
+# Chunks shorter than this (captions, headers, page numbers) are auto-passed
+MIN_VALIDATION_CHARS = int(os.getenv("MIN_VALIDATION_CHARS", "40"))
+
+
+def _skipped_result(
+    source_text: str,
+    translated_text: str,
+    target_lang: str,
+    source_lang: str
+) -> Optional[dict]:
+    """
+    Settle short and unchanged chunks without an LLM call.
+
+    Tiny chunks are auto-passed. A translation identical to its source is what
+    refusals, empty outputs and failed translations fall back to, so it fails
+    validation unless the source is already in the target language.
+    """
+    source_stripped = source_text.strip()
+    unchanged = source_stripped == translated_text.strip()
+
+    if len(source_stripped) < MIN_VALIDATION_CHARS or (unchanged and same_language(source_lang, target_lang)):
+        return {
+            "quality_score": 100,
+            "accuracy_score": 100,
+            "completeness_score": 100,
+            "fluency_score": 100,
+            "terminology_score": 100,
+            "issues": [],
+            "overall_assessment": "Validation skipped (short text or already in the target language)",
+            "recommendation": "pass",
+            "text_length": len(source_text),
+            "validation_type": "skipped"
+        }
+
+    if unchanged:
+        return {
+            "quality_score": 0,
+            "accuracy_score": 0,
+            "completeness_score": 0,
+            "fluency_score": 0,
+            "terminology_score": 0,
+            "issues": [{
+                "severity": "high",
+                "type": "untranslated",
+                "description": "Translation is identical to the source text",
+                "location": "entire text"
+            }],
+            "overall_assessment": "Not translated (refused, empty or failed translation kept the source text)",
+            "recommendation": "retranslate",
+            "text_length": len(source_text),
+            "validation_type": "untranslated"
+        }
+
+    return None
+
 
 async def validate_translation(
     source_text: str,
@@ -27,6 +85,10 @@ async def validate_translation(
     Returns:
         Detailed quality assessment dictionary
     """
+    skipped = _skipped_result(source_text, translated_text, target_lang, source_lang)
+    if skipped is not None:
+        return skipped
+
     prompt = f"""
 Source Language: {source_lang}
 Target Language: {target_lang}
@@ -37,17 +99,18 @@ ORIGINAL TEXT:
 TRANSLATED TEXT:
 {translated_text}
 
-Evaluate this translation quality and return your assessment in JSON format.
+Evaluate this translation quality.
 """
 
     try:
         result = await Runner.run(
             validator_agent,
-            input=prompt.strip()
+            input=prompt.strip(),
+            run_config=get_retrying_run_config()
         )
 
-        # Parse the comprehensive validation result
-        validation_result = json.loads(result.final_output)
+        # Structured output: the agent returns a parsed ValidationResult
+        validation_result = result.final_output.model_dump()
 
         # Add metadata
         validation_result["text_length"] = len(source_text)
@@ -60,24 +123,6 @@ Evaluate this translation quality and return your assessment in JSON format.
 
         return validation_result
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse validator output: {e}")
-        return {
-            "quality_score": 0,
-            "accuracy_score": 0,
-            "completeness_score": 0,
-            "fluency_score": 0,
-            "terminology_score": 0,
-            "issues": [{
-                "severity": "critical",
-                "type": "validation_error",
-                "description": "Validator returned invalid JSON",
-                "location": "N/A"
-            }],
-            "overall_assessment": "Validation failed - unable to assess quality",
-            "recommendation": "retranslate",
-            "validation_type": "error"
-        }
     except Exception as e:
         logger.error(f"Validation error: {e}")
         return {
@@ -98,6 +143,76 @@ Evaluate this translation quality and return your assessment in JSON format.
         }
 
 
+async def validate_translations_batch(
+    pairs: List[Tuple[str, str]],
+    target_lang: str,
+    source_lang: str = "en"
+) -> List[dict]:
+    """
+    Validate several (source, translation) pairs with a single validator call.
+
+    All pairs share one prompt and one round-trip; the validator returns one
+    assessment per segment in order. If the call fails or the number of results
+    doesn't match, each pair is validated individually instead.
+
+    Args:
+        pairs: (source_text, translated_text) tuples
+        target_lang: Target language code
+        source_lang: Source language code (default: en)
+
+    Returns:
+        Quality assessment dictionaries aligned with ``pairs``
+    """
+    results: List[Optional[dict]] = [
+        _skipped_result(src, tgt, target_lang, source_lang) for src, tgt in pairs
+    ]
+    pending = [idx for idx, result in enumerate(results) if result is None]
+
+    if len(pending) == 1:
+        src, tgt = pairs[pending[0]]
+        results[pending[0]] = await validate_translation(src, tgt, target_lang, source_lang)
+    elif pending:
+        segments = "\n\n".join(
+            f"=== SEGMENT {n} ===\nORIGINAL TEXT:\n{pairs[idx][0]}\n\nTRANSLATED TEXT:\n{pairs[idx][1]}"
+            for n, idx in enumerate(pending, start=1)
+        )
+        prompt = (
+            f"Source Language: {source_lang}\nTarget Language: {target_lang}\n\n"
+            f"{segments}\n\n"
+            f"Evaluate each of the {len(pending)} segments independently and return "
+            f"one assessment per segment, in segment order."
+        )
+
+        try:
+            result = await Runner.run(
+                batch_validator_agent,
+                input=prompt,
+                run_config=get_retrying_run_config()
+            )
+            assessments = result.final_output.results
+            if len(assessments) != len(pending):
+                raise ValueError(f"validator returned {len(assessments)} results for {len(pending)} segments")
+
+            for idx, assessment in zip(pending, assessments):
+                validation_result = assessment.model_dump()
+                validation_result["text_length"] = len(pairs[idx][0])
+                validation_result["validation_type"] = "full"
+                results[idx] = validation_result
+
+            logger.info(f"Batch validation complete for {len(pending)} segments")
+
+        except Exception as e:
+            logger.warning(f"Batch validation failed, validating segments individually: {e}")
+            individual = await asyncio.gather(*(
+                validate_translation(pairs[idx][0], pairs[idx][1], target_lang, source_lang)
+                for idx in pending
+            ))
+            for idx, validation_result in zip(pending, individual):
+                results[idx] = validation_result
+
+    return results
+
+
 async def validate_large_document(
     source_chunks: List[str],
     translated_chunks: List[str],
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 import html
 import re
 import tempfile
+from typing import Iterable
 
 from docx import Document
 from reportlab.lib.pagesizes import A4
@@ -52,12 +53,17 @@ class Writer(ABC):
 
 
 class PdfWriter(Writer):
-    """Produce a nicely formatted PDF with proper text wrapping."""
+    """
+    Produce a nicely formatted PDF with proper text wrapping.
+
+    Pages are consumed one at a time, so any iterable (e.g. a generator) works
+    and no joined copy of the document text is built.
+    """
 
     # Page geometry
     _MARGIN = 25 * mm  # ~1 inch
 
-    def write(self, pages: list[str], original_path: str) -> str:
+    def write(self, pages: Iterable[str], original_path: str) -> str:
         with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
             file_path = tmp.name
 
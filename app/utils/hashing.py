@@ -11,3 +11,24 @@ def hash_bytes(data: bytes) -> str:
     - idempotency
     """
     return hashlib.sha256(data).hexdigest()
+
+
+def chunk_key(text: str, lang: str, context: str | None = None) -> bytes:
+    """
+    Compact, process-independent key for a (text, target language[, context]) tuple.
+
+    BLAKE2b is faster than SHA-256 on short inputs; unlike hash((text, lang))
+    the result is stable across processes, so it is safe for shared caches.
+    The parts are fed incrementally, so no joined copy of the text is built.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(lang.encode("utf-8"))
+    if context is not None:
+        # Length-prefixed so no (context, text) split collides with another
+        encoded = context.encode("utf-8")
+        h.update(b"\x01")
+        h.update(len(encoded).to_bytes(8, "little"))
+        h.update(encoded)
+    h.update(b"\x00")
+    h.update(text.encode("utf-8"))
+    return h.digest()
@@ -10,6 +10,19 @@ SUPPORTED_LANGUAGES = {
     "chinese",
 }
 
+# ISO 639-1 codes of the supported languages
+LANGUAGE_CODES = {
+    "en": "english",
+    "fr": "french",
+    "de": "german",
+    "es": "spanish",
+    "it": "italian",
+    "pt": "portuguese",
+    "hi": "hindi",
+    "ja": "japanese",
+    "zh": "chinese",
+}
+
 def normalize_language(lang: str) -> str:
     """
     Normalize user-provided language input.
@@ -19,3 +32,9 @@ def normalize_language(lang: str) -> str:
 
 def is_supported_language(lang: str) -> bool:
     return normalize_language(lang) in SUPPORTED_LANGUAGES
+
+
+def same_language(lang_a: str, lang_b: str) -> bool:
+    """Whether two language names or codes (e.g. 'en' and 'English') are the same language."""
+    a, b = normalize_language(lang_a), normalize_language(lang_b)
+    return LANGUAGE_CODES.get(a, a) == LANGUAGE_CODES.get(b, b)
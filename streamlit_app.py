@@ -158,17 +158,48 @@ def _drain_queue():
 # =================================================
 # ASYNC TRANSLATION (RUNS IN THREAD EVENT LOOP)
 # =================================================
+UPLOAD_CHUNK_SIZE = 256 * 1024
+UPLOAD_WINDOW = 4  # unacknowledged chunks allowed in flight
+
+
+async def _await_ack(ws) -> None:
+    data = json.loads(await ws.recv())
+    if data["type"] == "error":
+        raise RuntimeError(data["message"])
+
+
+async def _upload_file(ws, file_bytes: bytes) -> None:
+    """Send the file as framed chunks, keeping at most UPLOAD_WINDOW unacknowledged."""
+    view = memoryview(file_bytes)
+    total_chunks = max(1, -(-len(file_bytes) // UPLOAD_CHUNK_SIZE))
+    in_flight = 0
+
+    for seq in range(total_chunks):
+        await ws.send(json.dumps({"type": "chunk", "seq": seq, "last": seq == total_chunks - 1}))
+        await ws.send(view[seq * UPLOAD_CHUNK_SIZE:(seq + 1) * UPLOAD_CHUNK_SIZE])
+        in_flight += 1
+
+        if in_flight >= UPLOAD_WINDOW:
+            await _await_ack(ws)
+            in_flight -= 1
+
+    while in_flight:
+        await _await_ack(ws)
+        in_flight -= 1
+
+
 async def _translate_ws(file_bytes: bytes, filename: str, language: str, output_format: str, q: queue.Queue):
     """Run the WebSocket translation and push messages to *q*."""
     try:
         uri = os.environ.get("BACKEND_WS_URL", "ws://127.0.0.1:8000/ws/translate")
-        async with websockets.connect(uri, max_size=50 * 1024 * 1024) as ws:
+        # Offer permessage-deflate so the JSON progress/validation frames are compressed
+        async with websockets.connect(uri, max_size=50 * 1024 * 1024, compression="deflate") as ws:
             await ws.send(json.dumps({
                 "filename": filename,
                 "target_language": language,
                 "output_format": output_format,
             }))
-            await ws.send(file_bytes)
+            await _upload_file(ws, file_bytes)
 
             while True:
                 msg = await ws.recv()
@@ -189,10 +220,13 @@ async def _translate_ws(file_bytes: bytes, filename: str, language: str, output_
                         })
 
                     elif data["type"] == "file":
-                        pdf_bytes = await ws.recv()
+                        # Binary slices follow until an {"type": "eof"} frame
+                        pdf_bytes = bytearray()
+                        while isinstance(chunk := await ws.recv(), bytes):
+                            pdf_bytes += chunk
                         q.put({
                             "type": "file",
-                            "bytes": pdf_bytes,
+                            "bytes": bytes(pdf_bytes),
                             "filename": data["filename"],
                         })
                         break
@@ -0,0 +1,162 @@
+"""
+Tests for DocxLoader's lxml text path: it must return the same text as
+python-docx's doc.paragraphs. Run with: python -m pytest -q test_docx_loader.py
+"""
+from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.oxml import parse_xml
+from docx.shared import Inches
+
+from app.services.loader import DocxLoader
+
+_NSDECLS = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:v="urn:schemas-microsoft-com:vml" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+
+# A run holding a text box, written the way Word does: the DrawingML shape in
+# mc:Choice and the VML copy of the same text in mc:Fallback
+_TEXT_BOX_RUN = f"""
+<w:r {_NSDECLS}>
+  <mc:AlternateContent>
+    <mc:Choice Requires="wps">
+      <w:drawing>
+        <wp:anchor>
+          <a:graphic>
+            <a:graphicData uri="http://schemas.microsoft.com/office/word/2010/wordprocessingShape">
+              <wps:wsp>
+                <wps:txbx>
+                  <w:txbxContent><w:p><w:r><w:t>Boxed text</w:t></w:r></w:p></w:txbxContent>
+                </wps:txbx>
+              </wps:wsp>
+            </a:graphicData>
+          </a:graphic>
+        </wp:anchor>
+      </w:drawing>
+    </mc:Choice>
+    <mc:Fallback>
+      <w:pict>
+        <v:shape>
+          <v:textbox>
+            <w:txbxContent><w:p><w:r><w:t>Boxed text</w:t></w:r></w:p></w:txbxContent>
+          </v:textbox>
+        </v:shape>
+      </w:pict>
+    </mc:Fallback>
+  </mc:AlternateContent>
+</w:r>
+"""
+
+_HYPERLINK = f"""
+<w:hyperlink {_NSDECLS} r:id="rId99">
+  <w:r><w:t xml:space="preserve">linked </w:t></w:r><w:r><w:t>text</w:t></w:r>
+</w:hyperlink>
+"""
+
+_SPECIAL_RUN = f"""
+<w:r {_NSDECLS}>
+  <w:t>non</w:t><w:noBreakHyphen/><w:t>breaking</w:t><w:ptab w:relativeTo="margin" w:alignment="right" w:leader="none"/><w:t>end</w:t><w:cr/>
+</w:r>
+"""
+
+
+def _build_docx(path):
+    doc = Document()
+
+    # Tab-stop definitions live in w:pPr/w:tabs and are not text
+    para = doc.add_paragraph("Name")
+    para.paragraph_format.tab_stops.add_tab_stop(Inches(1))
+    para.paragraph_format.tab_stops.add_tab_stop(Inches(2))
+    para.add_run().add_tab()
+    para.add_run("Value")
+
+    # Text box content is not part of the anchoring paragraph's text
+    para = doc.add_paragraph("Before box ")
+    para._p.append(parse_xml(_TEXT_BOX_RUN))
+    para.add_run(" after box")
+
+    # Line breaks are "\n"; page and column breaks are ""
+    para = doc.add_paragraph()
+    run = para.add_run("line one")
+    run.add_break()
+    run.add_text("line two")
+    run.add_break(WD_BREAK.PAGE)
+    run.add_text("next page")
+    run.add_break(WD_BREAK.COLUMN)
+
+    para = doc.add_paragraph("See ")
+    para._p.append(parse_xml(_HYPERLINK))
+
+    para = doc.add_paragraph()
+    para._p.append(parse_xml(_SPECIAL_RUN))
+
+    # Table cell paragraphs are not in doc.paragraphs
+    doc.add_table(rows=1, cols=2).cell(0, 0).text = "cell text"
+
+    doc.add_paragraph("")
+    doc.add_paragraph("Last paragraph")
+    doc.save(path)
+
+
+def test_body_text_matches_python_docx(tmp_path):
+    path = str(tmp_path / "sample.docx")
+    _build_docx(path)
+
+    expected = "\n".join(p.text for p in Document(path).paragraphs)
+
+    assert DocxLoader()._load_body_text(path) == expected
+    assert DocxLoader().load(path) == [expected]
+
+
+def test_tab_stops_text_boxes_and_page_breaks(tmp_path):
+    path = str(tmp_path / "sample.docx")
+    _build_docx(path)
+
+    lines = DocxLoader()._load_body_text(path).split("\n")
+
+    assert lines[0] == "Name\tValue"
+    assert lines[1] == "Before box  after box"
+    assert lines[2:4] == ["line one", "line twonext page"]
+    assert "Boxed text" not in lines
+    assert "cell text" not in lines
+
+
+def test_parsed_elements_are_released(tmp_path, monkeypatch):
+    from app.services import loader
+
+    path = str(tmp_path / "tables.docx")
+    doc = Document()
+    for i in range(3):
+        doc.add_paragraph(f"Paragraph {i}")
+        table = doc.add_table(rows=2, cols=2)
+        for cell in table._cells:
+            cell.text = f"cell {i}"
+    doc.add_paragraph("Last paragraph")
+    doc.save(path)
+
+    seen = []
+    paragraph_text = loader._docx_paragraph_text
+
+    def recording_paragraph_text(p):
+        # Body children still attached before this paragraph, and whether the
+        # paragraphs inside them have been cleared
+        previous = list(p.itersiblings(preceding=True))
+        seen.append((
+            [element.tag.rsplit("}", 1)[1] for element in previous],
+            all(len(cell_p) == 0 for element in previous for cell_p in element.iter(loader._W_P)),
+        ))
+        return paragraph_text(p)
+
+    monkeypatch.setattr(loader, "_docx_paragraph_text", recording_paragraph_text)
+
+    text = DocxLoader()._load_body_text(path)
+
+    assert text.split("\n") == ["Paragraph 0", "Paragraph 1", "Paragraph 2", "Last paragraph"]
+    # Only the previous (cleared) body paragraph and the table after it are
+    # still attached; everything before them was removed from w:body
+    assert seen == [([], True)] + [(["tbl", "p"], True)] * 3
@@ -0,0 +1,122 @@
+"""
+Tests for LargeDocumentTranslator's output_stream mode: the streamed text must
+be identical to the returned text on the context, parallel and Batch API paths.
+Chunking and the translator are replaced with fakes.
+Run with: python -m pytest -q test_large_doc_translation.py
+"""
+import asyncio
+import io
+
+import pytest
+
+from app.services import large_doc_translation, translation
+from app.services.large_doc_translation import LargeDocumentTranslator
+
+CHUNKS = [f"chunk {i}. " for i in range(7)]
+
+
+@pytest.fixture(autouse=True)
+def fake_chunker(monkeypatch):
+    def chunk_text_with_metadata(text, max_tokens, overlap_tokens):
+        return [
+            {"index": i, "text_core": chunk, "has_overlap": i > 0}
+            for i, chunk in enumerate(CHUNKS)
+        ]
+
+    monkeypatch.setattr(large_doc_translation.chunker, "chunk_text_with_metadata", chunk_text_with_metadata)
+
+
+# Per-chunk delay in 10 ms steps; by default later chunks finish first
+REVERSED = [len(CHUNKS) - i for i in range(len(CHUNKS))]
+
+
+@pytest.fixture
+def completion_order(monkeypatch):
+    """Fake translator that finishes chunks in ``delays`` order; records completion order."""
+    order = []
+    delays = list(REVERSED)
+
+    async def fake_translate_text(text, target_lang, context=None):
+        index = CHUNKS.index(text)
+        await asyncio.sleep(delays[index] * 0.01)
+        order.append(index)
+        return f"[{text.strip()}|{context is not None}]"
+
+    async def fake_translate_via_batch_api(chunks, target_lang):
+        return [f"[{chunk.strip()}|batch]" for chunk in chunks]
+
+    monkeypatch.setattr(translation, "translate_text", fake_translate_text)
+    monkeypatch.setattr(translation, "translate_via_batch_api", fake_translate_via_batch_api)
+    return order, delays
+
+
+def _translate(**kwargs):
+    translator = LargeDocumentTranslator(max_concurrency=len(CHUNKS), batch_size=3)
+    return asyncio.run(translator.translate_large_text("".join(CHUNKS), "French", **kwargs))
+
+
+@pytest.mark.parametrize("options", [
+    {"use_context": True},
+    {"use_context": False},
+    {"use_batch_api": True},
+], ids=["context", "parallel", "batch_api"])
+def test_streamed_output_matches_returned_text(completion_order, options):
+    expected = _translate(**options)
+    stream = io.StringIO()
+
+    assert _translate(output_stream=stream, **options) == ""
+    assert stream.getvalue() == expected
+    assert expected.count("[chunk") == len(CHUNKS)
+
+
+def test_parallel_reorders_out_of_order_completions(completion_order):
+    order, _ = completion_order
+    stream = io.StringIO()
+    progress = []
+
+    async def progress_callback(value):
+        progress.append(value)
+
+    _translate(use_context=False, output_stream=stream, progress_callback=progress_callback)
+
+    # The last chunk finished first, yet the stream is in document order
+    assert order == sorted(order, reverse=True)
+    assert stream.getvalue() == "".join(f"[{chunk.strip()}|False]" for chunk in CHUNKS)
+    assert progress == sorted(progress) and progress[-1] == 100
+
+
+class _RecordingStream(io.StringIO):
+    """Records each write with the number of chunks completed at that moment."""
+
+    def __init__(self, order):
+        super().__init__()
+        self.order = order
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append((text, len(self.order)))
+        return super().write(text)
+
+
+def test_parallel_writes_each_contiguous_run_once_ready(completion_order):
+    order, delays = completion_order
+    # Completion order: 1, 0, 2, 5, 4, 3, 6
+    delays[:] = [2, 1, 3, 6, 5, 4, 7]
+    stream = _RecordingStream(order)
+
+    _translate(use_context=False, output_stream=stream)
+
+    assert order == [1, 0, 2, 5, 4, 3, 6]
+    # 0 and 1 flush together once 0 is done, 2 right away, 3-5 once 3 is done, then 6
+    assert [done for _, done in stream.writes] == [2, 2, 3, 6, 6, 6, 7]
+    assert [text for text, _ in stream.writes] == [f"[{chunk.strip()}|False]" for chunk in CHUNKS]
+
+
+def test_empty_document_writes_nothing(monkeypatch, completion_order):
+    monkeypatch.setattr(
+        large_doc_translation.chunker, "chunk_text_with_metadata", lambda text, **kwargs: []
+    )
+    stream = io.StringIO()
+
+    assert _translate(output_stream=stream) == ""
+    assert stream.getvalue() == ""
@@ -0,0 +1,63 @@
+"""
+Tests for TranslationOrchestrator file handling. The format workflows are
+replaced with fakes that only write files. Run with: python -m pytest -q test_orchestrator.py
+"""
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from app import orchestrator
+from app.orchestrator import TranslationOrchestrator
+
+
+class _FakeConverter:
+    created = []
+
+    @classmethod
+    def docx_to_pdf(cls, docx_path):
+        with open(docx_path, "rb") as f:
+            content = f.read()
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            tmp.write(b"PDF:" + content)
+        cls.created.append(tmp.name)
+        return tmp.name
+
+
+@pytest.fixture
+def fake_docx_workflow(monkeypatch):
+    intermediates = []
+
+    async def fake_translate_docx(self, file_path, target_language, progress_callback=None):
+        with open(file_path, "rb") as f:
+            content = f.read()
+        # Written outside the spool directory, like DocxWriter does
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
+            tmp.write(content.upper())
+        intermediates.append(tmp.name)
+        return tmp.name
+
+    monkeypatch.setattr(TranslationOrchestrator, "_translate_docx", fake_translate_docx)
+    monkeypatch.setattr(orchestrator, "_format_converter", lambda: _FakeConverter)
+    return intermediates
+
+
+def test_translate_bytes_leaves_no_files_behind(fake_docx_workflow):
+    result = asyncio.run(TranslationOrchestrator().translate_bytes(
+        b"hello", "doc.docx", "French", output_format="PDF"
+    ))
+
+    assert result == b"PDF:HELLO"
+    assert len(fake_docx_workflow) == 1
+    assert not os.path.exists(fake_docx_workflow[0])
+    assert not os.path.exists(_FakeConverter.created[-1])
+
+
+def test_translate_bytes_native_format(fake_docx_workflow):
+    result = asyncio.run(TranslationOrchestrator().translate_bytes(
+        b"hello", "doc.docx", "French", output_format="DOCX"
+    ))
+
+    assert result == b"HELLO"
+    assert not os.path.exists(fake_docx_workflow[0])
@@ -0,0 +1,68 @@
+"""
+Tests for PptxTranslationService's batch translation and per-item fallback.
+The translator model is replaced with a fake.
+Run with: python -m pytest -q test_pptx_translation.py
+"""
+import asyncio
+
+import pytest
+
+from app.services import translation
+from app.services.pptx_translation import PptxTranslationService
+
+
+@pytest.fixture(autouse=True)
+def no_cache():
+    token = translation.cache_enabled.set(False)
+    yield
+    translation.cache_enabled.reset(token)
+
+
+@pytest.fixture
+def translator(monkeypatch):
+    """Fake model: packed requests containing "Label 3" raise, everything else is bracketed."""
+    prompts = []
+
+    async def fake_run_translator(prompt: str) -> str:
+        prompts.append(prompt)
+        await asyncio.sleep(0.001)
+        text = prompt.split("Text:\n", 1)[1]
+        if "Label 3" in text and translation.BATCH_SEPARATOR in text:
+            raise RuntimeError("provider down")
+        return translation.BATCH_SEPARATOR.join(
+            f"<{segment}>" for segment in text.split(translation.BATCH_SEPARATOR)
+        )
+
+    monkeypatch.setattr(translation, "_run_translator", fake_run_translator)
+    return prompts
+
+
+def _slides(count):
+    return [{
+        "shapes": [{
+            "type": "text",
+            "paragraphs": [{"text": f"Label {i}", "runs": [{"text": f"Label {i}"}]}],
+        } for i in range(count)],
+    }]
+
+
+def test_failed_batch_retries_only_its_items(monkeypatch, translator):
+    monkeypatch.setattr(translation, "translate_batch", _with_max_items(translation.translate_batch, 3))
+    progress = []
+
+    async def progress_callback(value):
+        progress.append(value)
+
+    slides = asyncio.run(PptxTranslationService().translate_slides(_slides(6), "French", progress_callback))
+
+    texts = [shape["paragraphs"][0]["text"] for shape in slides[0]["shapes"]]
+    assert texts == [f"<Label {i}>" for i in range(6)]
+    # Two packed requests, then Labels 3-5 one by one; Labels 0-2 aren't re-sent
+    assert len(translator) == 5
+    assert progress == sorted(progress) and progress[-1] == 100
+
+
+def _with_max_items(translate_batch, max_items):
+    async def wrapper(*args, **kwargs):
+        return await translate_batch(*args, max_items=max_items, **kwargs)
+    return wrapper
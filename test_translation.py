@@ -0,0 +1,291 @@
+"""
+Tests for translate_text's in-flight coalescing and translate_batch packing.
+
+The translator model is never called: translation._run_translator is replaced
+with a fake. Run with: python -m pytest -q test_translation.py
+"""
+import asyncio
+
+import pytest
+
+from app.services import translation
+
+
+@pytest.fixture(autouse=True)
+def no_cache():
+    """Exercise the request paths on their own, without the translation cache."""
+    token = translation.cache_enabled.set(False)
+    yield
+    translation.cache_enabled.reset(token)
+
+
+@pytest.fixture
+def translator(monkeypatch):
+    """Fake model that blocks until ``release`` is set and records every prompt."""
+    calls = []
+    release = asyncio.Event()
+
+    async def fake_run_translator(prompt: str) -> str:
+        calls.append(prompt)
+        await release.wait()
+        return f"translated:{prompt.rsplit(chr(10), 1)[-1]}"
+
+    monkeypatch.setattr(translation, "_run_translator", fake_run_translator)
+    return calls, release
+
+
+def test_concurrent_duplicates_share_one_request(translator):
+    calls, release = translator
+
+    async def run():
+        tasks = [asyncio.create_task(translation.translate_text("Hello", "French")) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(run()) == ["translated:Hello"] * 3
+    assert len(calls) == 1
+    assert translation._in_flight == {}
+
+
+def test_different_context_is_not_coalesced(translator):
+    calls, release = translator
+
+    async def run():
+        tasks = [
+            asyncio.create_task(translation.translate_text("Hello", "French", context="first")),
+            asyncio.create_task(translation.translate_text("Hello", "French", context="second")),
+            asyncio.create_task(translation.translate_text("Hello", "French")),
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert len(calls) == 3
+    assert "first" in calls[0] and "second" in calls[1]
+
+
+def test_cancelled_owner_does_not_cancel_other_waiters(translator):
+    calls, release = translator
+
+    async def run():
+        owner = asyncio.create_task(translation.translate_text("Hello", "French"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(translation.translate_text("Hello", "French"))
+        await asyncio.sleep(0)
+
+        # e.g. the owner's websocket disconnected
+        owner.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await waiter
+
+    assert asyncio.run(run()) == "translated:Hello"
+    assert len(calls) == 1
+
+
+def test_request_is_cancelled_when_every_caller_is(translator):
+    calls, release = translator
+
+    async def run():
+        callers = [asyncio.create_task(translation.translate_text("Hello", "French")) for _ in range(2)]
+        await asyncio.sleep(0)
+        task = translation._in_flight[translation.chunk_key("Hello", "French")].task
+
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        # A new caller starts a fresh request instead of joining the cancelled one
+        assert translation._in_flight == {}
+        release.set()
+        result = await translation.translate_text("Hello", "French")
+        return task, result
+
+    task, result = asyncio.run(run())
+    assert task.cancelled()
+    assert result == "translated:Hello"
+    assert len(calls) == 2
+
+
+def test_failure_reaches_every_waiter(monkeypatch):
+    async def failing_run_translator(prompt: str) -> str:
+        await asyncio.sleep(0)
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(translation, "_run_translator", failing_run_translator)
+
+    async def run():
+        return await asyncio.gather(
+            translation.translate_text("Hello", "French"),
+            translation.translate_text("Hello", "French"),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+    assert translation._in_flight == {}
+
+
+@pytest.fixture
+def batch_translator(monkeypatch):
+    """
+    Fake model that translates each %%-separated segment; ``drop`` loses the
+    last one and a packed request containing ``fail`` raises.
+    """
+    state = {"calls": [], "drop": False, "fail": None, "active": 0, "peak": 0}
+
+    async def fake_run_translator(prompt: str) -> str:
+        state["calls"].append(prompt)
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+
+        text = prompt.split("Text:\n", 1)[1]
+        if state["fail"] and state["fail"] in text and translation.BATCH_SEPARATOR in text:
+            raise RuntimeError("provider down")
+        segments = [f"<{segment}>" for segment in text.split(translation.BATCH_SEPARATOR)]
+        if state["drop"] and len(segments) > 1:
+            segments.pop()
+        return translation.BATCH_SEPARATOR.join(segments)
+
+    monkeypatch.setattr(translation, "_run_translator", fake_run_translator)
+    return state
+
+
+def test_translate_batch_packs_and_fans_out_duplicates(batch_translator):
+    chunks = ["header", "page one", "header", "page two", "header"]
+    done = []
+
+    async def on_batch_done(count):
+        done.append(count)
+
+    result = asyncio.run(translation.translate_batch(chunks, "French", on_batch_done=on_batch_done))
+
+    assert result == ["<header>", "<page one>", "<header>", "<page two>", "<header>"]
+    # One request for the three distinct chunks; progress counts every occurrence
+    assert len(batch_translator["calls"]) == 1
+    assert sum(done) == len(chunks)
+
+
+def test_translate_batch_respects_limits(batch_translator):
+    chunks = [f"chunk {i}" for i in range(7)]
+
+    result = asyncio.run(translation.translate_batch(chunks, "French", max_items=3))
+
+    assert result == [f"<chunk {i}>" for i in range(7)]
+    assert len(batch_translator["calls"]) == 3
+
+
+def test_translate_batch_misaligned_segments_fall_back(batch_translator):
+    batch_translator["drop"] = True
+
+    result = asyncio.run(translation.translate_batch(["one", "two", "three"], "French"))
+
+    # The packed reply lost a segment, so each chunk was translated on its own
+    assert result == ["<one>", "<two>", "<three>"]
+    assert len(batch_translator["calls"]) == 4
+
+
+def test_translate_batch_holds_semaphore_per_batch(batch_translator):
+    chunks = [f"chunk {i}" for i in range(10)]
+
+    async def run():
+        return await translation.translate_batch(
+            chunks, "French", max_items=1, semaphore=asyncio.Semaphore(2)
+        )
+
+    asyncio.run(run())
+    assert len(batch_translator["calls"]) == 10
+    assert batch_translator["peak"] == 2
+
+
+def test_shared_clients_leave_retries_to_the_translator(monkeypatch):
+    from app.services import openai_client
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    for name in ("_openai_client", "_sync_openai_client", "_retrying_run_config"):
+        monkeypatch.setattr(openai_client, name, None)
+
+    client = openai_client.get_openai_client()
+    retrying = openai_client.get_retrying_run_config().model_provider._client
+
+    assert client.max_retries == 0
+    assert openai_client.get_sync_openai_client().max_retries == 0
+    # Validation keeps the SDK's retries on the same connection pool
+    assert retrying.max_retries == openai_client.SDK_MAX_RETRIES
+    assert retrying._client is client._client
+
+
+def test_map_with_workers_bounds_concurrency_and_reports_progress():
+    state = {"active": 0, "peak": 0}
+    progress = []
+
+    async def double(item):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.001 * (item % 3))
+        state["active"] -= 1
+        return item * 2
+
+    async def progress_callback(value):
+        progress.append(value)
+
+    result = asyncio.run(translation.map_with_workers(
+        list(range(10)), double, 3, progress_callback, lambda done, total: done * 100 // total
+    ))
+
+    assert result == [item * 2 for item in range(10)]
+    assert state["peak"] == 3
+    assert progress == [10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+
+
+def test_map_with_workers_cancels_other_workers_on_error():
+    finished = []
+
+    async def work(item):
+        if item == 0:
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.05)
+        finished.append(item)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(translation.map_with_workers(list(range(4)), work, 2))
+    assert finished == []
+
+
+def test_translate_batch_falls_back_only_for_failed_batches(batch_translator):
+    batch_translator["fail"] = "chunk 4"
+    chunks = [f"chunk {i}" for i in range(6)]
+    fallback_calls = []
+    progress = []
+
+    async def fallback(texts):
+        fallback_calls.append(texts)
+        return [f"fallback:{text}" for text in texts]
+
+    async def on_batch_done(count):
+        progress.append(count)
+
+    result = asyncio.run(translation.translate_batch(
+        chunks, "French", max_items=3, on_batch_done=on_batch_done, fallback=fallback
+    ))
+
+    assert result == ["<chunk 0>", "<chunk 1>", "<chunk 2>",
+                      "fallback:chunk 3", "fallback:chunk 4", "fallback:chunk 5"]
+    assert fallback_calls == [["chunk 3", "chunk 4", "chunk 5"]]
+    # Every chunk is counted once, including the ones settled by the fallback
+    assert sorted(progress) == [3, 3]
+
+
+def test_translate_batch_without_fallback_raises(batch_translator):
+    batch_translator["fail"] = "chunk 1"
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(translation.translate_batch(["chunk 0", "chunk 1"], "French"))
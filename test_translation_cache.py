@@ -0,0 +1,193 @@
+"""
+Tests for the translation cache and the cache-aware translate paths.
+
+The translator model is never called: translation._run_translator is replaced
+with a fake that returns canned outputs. Run with: python -m pytest -q test_translation_cache.py
+"""
+import asyncio
+
+import pytest
+
+from app.orchestrator import TranslationOrchestrator
+from app.services import translation, validation
+from app.services.translation_cache import TranslationCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = TranslationCache(str(tmp_path / "translations.db"), namespace="test-model")
+    monkeypatch.setattr(translation, "get_translation_cache", lambda: cache)
+    return cache
+
+
+@pytest.fixture
+def translator(monkeypatch):
+    """Fake model: returns the queued outputs in order and records every prompt."""
+    calls = []
+    outputs = []
+
+    async def fake_run_translator(prompt: str) -> str:
+        calls.append(prompt)
+        return outputs.pop(0)
+
+    monkeypatch.setattr(translation, "_run_translator", fake_run_translator)
+    return calls, outputs
+
+
+def test_cache_miss_then_hit(cache):
+    assert cache.get("Hello", "French") is None
+
+    cache.set("Hello", "French", "Bonjour")
+
+    assert cache.get("Hello", "French") == "Bonjour"
+    assert cache.get("Hello", "German") is None
+
+
+def test_cache_persists_across_instances(tmp_path):
+    db_path = str(tmp_path / "translations.db")
+    cache = TranslationCache(db_path, namespace="m")
+    cache.set("Hello", "French", "Bonjour")
+    cache.flush()
+
+    assert TranslationCache(db_path, namespace="m").get("Hello", "French") == "Bonjour"
+    # Another translator model never sees this entry
+    assert TranslationCache(db_path, namespace="other").get("Hello", "French") is None
+
+
+def test_cache_delete(tmp_path):
+    db_path = str(tmp_path / "translations.db")
+    cache = TranslationCache(db_path)
+    cache.set("Hello", "French", "Bonjour")
+
+    cache.flush()
+
+    cache.delete("Hello", "French")
+
+    # The memory tier hides the entry before the delete is committed
+    assert cache.get("Hello", "French") is None
+    cache.flush()
+    assert cache.get("Hello", "French") is None
+    assert TranslationCache(db_path).get("Hello", "French") is None
+
+
+def test_disk_tier_batches_and_async_lookups(tmp_path):
+    db_path = str(tmp_path / "translations.db")
+    cache = TranslationCache(db_path)
+    cache.set_many([(f"text {i}", f"texte {i}") for i in range(200)], "French")
+    cache.flush()
+
+    # A fresh instance has an empty memory tier, so every hit comes from SQLite
+    fresh = TranslationCache(db_path)
+    texts = ["text 0", "missing", "text 199"]
+    assert asyncio.run(fresh.lookup_many(texts, "French")) == ["texte 0", None, "texte 199"]
+    assert asyncio.run(fresh.lookup("text 42", "French")) == "texte 42"
+
+
+def test_translate_text_uses_cache(cache, translator):
+    calls, outputs = translator
+    outputs.append("Bonjour")
+
+    first = asyncio.run(translation.translate_text("Hello", "French"))
+    second = asyncio.run(translation.translate_text("Hello", "French"))
+
+    assert first == second == "Bonjour"
+    assert len(calls) == 1
+
+
+def test_translate_text_cache_disabled(cache, translator):
+    calls, outputs = translator
+    cache.set("Hello", "French", "Bonjour")
+    outputs.append("Salut")
+
+    async def run():
+        token = translation.cache_enabled.set(False)
+        try:
+            return await translation.translate_text("Hello", "French")
+        finally:
+            translation.cache_enabled.reset(token)
+
+    assert asyncio.run(run()) == "Salut"
+    assert len(calls) == 1
+    # Nothing is written while the cache is disabled
+    assert cache.get("Hello", "French") == "Bonjour"
+
+
+def test_refresh_bypasses_and_replaces_cache(cache, translator):
+    calls, outputs = translator
+    cache.set("Hello", "French", "bad")
+    outputs.append("Bonjour")
+
+    result = asyncio.run(translation.translate_text("Hello", "French", refresh=True))
+
+    assert result == "Bonjour"
+    assert len(calls) == 1
+    assert cache.get("Hello", "French") == "Bonjour"
+
+
+def _run_retry(monkeypatch, scores):
+    """Run the orchestrator's validate-and-retry step with canned validation scores."""
+    validated = []
+
+    async def fake_validate(source, translated, target_language):
+        validated.append(translated)
+        score = scores.pop(0)
+        return {"quality_score": score, "recommendation": "pass" if score >= 60 else "retranslate"}
+
+    monkeypatch.setattr(validation, "validate_translation", fake_validate)
+
+    translated_chunks = ["bad"]
+    result = asyncio.run(TranslationOrchestrator()._validate_and_retry_chunk(
+        "Hello", translated_chunks, "French", 0
+    ))
+    return result, translated_chunks, validated
+
+
+def test_retry_retranslates_instead_of_reusing_cache(cache, translator, monkeypatch):
+    calls, outputs = translator
+    cache.set("Hello", "French", "bad")
+    outputs.append("Bonjour")
+
+    result, translated_chunks, validated = _run_retry(monkeypatch, [20, 90])
+
+    assert len(calls) == 1
+    assert validated == ["bad", "Bonjour"]
+    assert translated_chunks == ["Bonjour"]
+    assert result["quality_score"] == 90
+    assert cache.get("Hello", "French") == "Bonjour"
+
+
+def test_retry_that_fails_again_is_evicted(cache, translator, monkeypatch):
+    calls, outputs = translator
+    cache.set("Hello", "French", "bad")
+    outputs.append("still bad")
+
+    result, translated_chunks, _ = _run_retry(monkeypatch, [20, 30])
+
+    assert translated_chunks == ["still bad"]
+    assert result["quality_score"] == 30
+    assert cache.get("Hello", "French") is None
+
+
+def test_batch_api_skips_cached_and_repeated_chunks(cache, monkeypatch):
+    cache.set("Hello", "French", "Bonjour")
+    submitted = []
+
+    async def fake_batch_job(chunks, target_language):
+        submitted.append(chunks)
+        results = [chunk.upper() for chunk in chunks]
+        for chunk, text in zip(chunks, results):
+            cache.set(chunk, target_language, text)
+        return results
+
+    monkeypatch.setattr(translation, "_run_batch_job", fake_batch_job)
+
+    result = asyncio.run(translation.translate_via_batch_api(
+        ["Hello", "footer", "body", "footer"], "French"
+    ))
+
+    assert result == ["Bonjour", "FOOTER", "BODY", "FOOTER"]
+    assert submitted == [["footer", "body"]]
+
+    # Fully cached documents never submit a job
+    asyncio.run(translation.translate_via_batch_api(["footer", "Hello"], "French"))
+    assert len(submitted) == 1
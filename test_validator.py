@@ -0,0 +1,125 @@
+"""
+Tests for the validator's no-LLM shortcuts (short and unchanged chunks) and
+batched validation.
+Run with: python -m pytest -q test_validator.py
+"""
+import asyncio
+
+import pytest
+
+from app.models.responses import ValidationResult, ValidationResultBatch
+from app.orchestrator import TranslationOrchestrator
+from app.services import validation
+
+LONG_SOURCE = "This paragraph is long enough to need a real validator call."
+
+
+@pytest.fixture(autouse=True)
+def no_validator_calls(monkeypatch):
+    async def fail_run(*args, **kwargs):
+        raise AssertionError("the validator model should not be called")
+
+    monkeypatch.setattr(validation.Runner, "run", fail_run)
+
+
+def test_short_chunks_auto_pass():
+    result = asyncio.run(validation.validate_translation("Page 3", "Page 3", "French"))
+
+    assert result["validation_type"] == "skipped"
+    assert result["quality_score"] == 100
+
+
+def test_unchanged_translation_fails():
+    result = asyncio.run(validation.validate_translation(LONG_SOURCE, LONG_SOURCE + "\n", "French"))
+
+    assert result["validation_type"] == "untranslated"
+    assert result["quality_score"] == 0
+    assert result["recommendation"] == "retranslate"
+
+
+@pytest.mark.parametrize("target_lang", ["English", "en", " english "])
+def test_unchanged_translation_passes_into_source_language(target_lang):
+    result = asyncio.run(validation.validate_translation(LONG_SOURCE, LONG_SOURCE, target_lang))
+
+    assert result["validation_type"] == "skipped"
+
+
+def test_batch_settles_short_and_unchanged_pairs_without_a_call():
+    results = asyncio.run(validation.validate_translations_batch(
+        [("Title", "Titre"), (LONG_SOURCE, LONG_SOURCE)],
+        "Spanish",
+    ))
+
+    assert [r["validation_type"] for r in results] == ["skipped", "untranslated"]
+
+
+def test_summary_counts_untranslated_chunks():
+    orchestrator = TranslationOrchestrator()
+    orchestrator._record_validation([
+        validation._skipped_result("Title", "Titre", "French", "en"),
+        validation._skipped_result(LONG_SOURCE, LONG_SOURCE, "French", "en"),
+    ])
+
+    summary = orchestrator.get_validation_summary()
+
+    assert summary["chunks_skipped"] == 1
+    assert summary["chunks_untranslated"] == 1
+    assert summary["average_quality_score"] == 50
+
+
+class _Output:
+    def __init__(self, final_output):
+        self.final_output = final_output
+
+
+def _assessment(score):
+    return ValidationResult(
+        quality_score=score,
+        accuracy_score=score,
+        completeness_score=score,
+        fluency_score=score,
+        terminology_score=score,
+        issues=[],
+        overall_assessment="ok",
+        recommendation="pass",
+    )
+
+
+@pytest.fixture
+def validator_model(monkeypatch):
+    """Fake validator: the batch agent returns ``batch_scores``; single calls return 70."""
+    state = {"batch_calls": 0, "single_calls": 0, "batch_scores": []}
+
+    async def fake_run(agent, input, run_config=None):
+        if agent is validation.batch_validator_agent:
+            state["batch_calls"] += 1
+            results = [_assessment(score) for score in state["batch_scores"]]
+            return _Output(ValidationResultBatch(results=results))
+        state["single_calls"] += 1
+        return _Output(_assessment(70))
+
+    monkeypatch.setattr(validation.Runner, "run", fake_run)
+    monkeypatch.setattr(validation, "get_retrying_run_config", lambda: None)
+    return state
+
+
+def test_batch_validates_pending_pairs_in_one_call(validator_model):
+    validator_model["batch_scores"] = [90, 80]
+    pairs = [(LONG_SOURCE, "Ce paragraphe..."), ("Title", "Titre"), (LONG_SOURCE + "!", "Ce paragraphe !")]
+
+    results = asyncio.run(validation.validate_translations_batch(pairs, "French"))
+
+    assert [r["quality_score"] for r in results] == [90, 100, 80]
+    assert [r["validation_type"] for r in results] == ["full", "skipped", "full"]
+    assert validator_model == {"batch_calls": 1, "single_calls": 0, "batch_scores": [90, 80]}
+
+
+def test_batch_count_mismatch_falls_back_to_single_calls(validator_model):
+    validator_model["batch_scores"] = [90]
+    pairs = [(LONG_SOURCE, "Ce paragraphe..."), (LONG_SOURCE + "!", "Ce paragraphe !")]
+
+    results = asyncio.run(validation.validate_translations_batch(pairs, "French"))
+
+    assert [r["quality_score"] for r in results] == [70, 70]
+    assert validator_model["batch_calls"] == 1
+    assert validator_model["single_calls"] == 2
@@ -0,0 +1,162 @@
+"""
+Tests for the /ws/translate framing: chunked upload with acks, the legacy
+single-frame upload, and the chunked download. The orchestrator is replaced
+with a fake that upper-cases the file. Run with: python -m pytest -q test_websocket.py
+"""
+import contextlib
+import os
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+
+class _FakeOrchestrator:
+    received = []
+
+    async def translate(self, input_path, target_language, progress_callback=None,
+                        output_format="PDF", enable_validation=True, **kwargs):
+        with open(input_path, "rb") as f:
+            content = f.read()
+        _FakeOrchestrator.received.append(content)
+
+        for progress in (10, 10, 50, 100):
+            await progress_callback(progress)
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            tmp.write(content.upper())
+        return tmp.name
+
+    def get_validation_summary(self):
+        return {"validation_enabled": False, "chunks_validated": 0}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    _FakeOrchestrator.received.clear()
+    monkeypatch.setattr(main, "TranslationOrchestrator", _FakeOrchestrator)
+    monkeypatch.setattr(main, "DOWNLOAD_CHUNK_SIZE", 4)
+    # Not used as a context manager, so the startup warmup (API calls) doesn't run
+    return TestClient(main.app)
+
+
+def _start(ws):
+    ws.send_json({"filename": "doc.txt", "target_language": "French", "output_format": "PDF"})
+
+
+def _receive_result(ws):
+    """Read frames up to eof; returns (progress values, validation frame, file header, content)."""
+    progress = []
+    while True:
+        message = ws.receive_json()
+        if message["type"] == "progress":
+            progress.append(message["value"])
+        elif message["type"] == "validation":
+            validation = message
+            break
+        else:
+            pytest.fail(f"unexpected frame {message}")
+
+    header = ws.receive_json()
+    assert header["type"] == "file"
+
+    content = b"".join(ws.receive_bytes() for _ in range(header["chunks"]))
+    assert ws.receive_json() == {"type": "eof"}
+    return progress, validation, header, content
+
+
+def test_chunked_upload_is_acked_and_download_is_framed(client):
+    parts = [b"hello ", b"chunked ", b"world"]
+
+    with client.websocket_connect("/ws/translate") as ws:
+        _start(ws)
+        for seq, part in enumerate(parts):
+            ws.send_json({"type": "chunk", "seq": seq, "last": seq == len(parts) - 1})
+            ws.send_bytes(part)
+            assert ws.receive_json() == {"type": "ack", "seq": seq}
+
+        progress, _, header, content = _receive_result(ws)
+
+    assert _FakeOrchestrator.received == [b"hello chunked world"]
+    assert header["filename"] == "translated_doc.pdf"
+    assert header["size"] == len(content) == 19
+    assert header["chunks"] == 5  # ceil(19 / 4)
+    assert content == b"HELLO CHUNKED WORLD"
+    # Repeated values are dropped and completion is always sent
+    assert progress[0] == 10 and progress[-1] == 100
+    assert len(progress) == len(set(progress))
+
+
+def test_single_binary_frame_upload(client):
+    with client.websocket_connect("/ws/translate") as ws:
+        _start(ws)
+        ws.send_bytes(b"legacy client")
+
+        _, _, header, content = _receive_result(ws)
+
+    assert _FakeOrchestrator.received == [b"legacy client"]
+    assert content == b"LEGACY CLIENT"
+    assert header["chunks"] == 4
+
+
+def test_empty_output_sends_no_chunks(client, monkeypatch):
+    async def empty_translate(self, input_path, *args, **kwargs):
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            pass
+        return tmp.name
+
+    monkeypatch.setattr(_FakeOrchestrator, "translate", empty_translate)
+
+    with client.websocket_connect("/ws/translate") as ws:
+        _start(ws)
+        ws.send_bytes(b"x")
+        _, _, header, content = _receive_result(ws)
+
+    assert header["size"] == 0 and header["chunks"] == 0
+    assert content == b""
+
+
+def test_lifespan_runs_warmup(monkeypatch):
+    calls = []
+
+    async def fake_warmup():
+        calls.append("warmup")
+
+    monkeypatch.setattr(main, "_warmup", fake_warmup)
+
+    with TestClient(main.app) as client:
+        assert calls == ["warmup"]
+        assert client.get("/health").json() == {"status": "ok"}
+
+
+@pytest.mark.parametrize("frames, reason", [
+    (["not json"], "not valid JSON"),
+    ([{"type": "upload", "seq": 0}], '{"type": "chunk"}'),
+    ([{"type": "chunk", "last": True}], "no integer seq"),
+    ([{"type": "chunk", "seq": 0}, b"a", {"type": "chunk", "seq": 0}], "does not follow 0"),
+    ([{"type": "chunk", "seq": 0}, "not bytes"], "not followed by a binary frame"),
+], ids=["not_json", "wrong_type", "missing_seq", "repeated_seq", "text_instead_of_bytes"])
+def test_malformed_chunk_header_is_a_protocol_error(client, monkeypatch, tmp_path, frames, reason):
+    # Keep the upload directory around so a leftover partial file would show
+    monkeypatch.setattr(tempfile, "TemporaryDirectory", lambda: contextlib.nullcontext(str(tmp_path)))
+
+    with client.websocket_connect("/ws/translate") as ws:
+        _start(ws)
+        for frame in frames:
+            if isinstance(frame, bytes):
+                ws.send_bytes(frame)
+                assert ws.receive_json()["type"] == "ack"
+            elif isinstance(frame, dict):
+                ws.send_json(frame)
+            else:
+                ws.send_text(frame)
+
+        error = ws.receive_json()
+
+    assert error["type"] == "error"
+    assert error["code"] == "protocol_error"
+    assert reason in error["message"]
+    assert _FakeOrchestrator.received == []
+    assert os.listdir(tmp_path) == []